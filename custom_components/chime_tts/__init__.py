@@ -1,8 +1,10 @@
 """The Chime TTS integration."""
 
+import json
 import logging
 import os
 import io
+import asyncio
 from datetime import datetime
 
 from pydub import AudioSegment
@@ -18,7 +20,7 @@ from homeassistant.components.media_player.const import (
     SERVICE_UNJOIN,
     MEDIA_TYPE_MUSIC,
 )
-from homeassistant.const import CONF_ENTITY_ID, SERVICE_VOLUME_SET
+from homeassistant.const import CONF_ENTITY_ID, SERVICE_VOLUME_SET, Platform
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant, ServiceResponse, SupportsResponse
 from homeassistant.helpers import storage
@@ -31,7 +33,14 @@ from homeassistant.exceptions import (
 )
 
 from .config_flow import ChimeTTSOptionsFlowHandler
+from .audio_cache import ChimeTTSAudioCache
+from .cache_index import ChimeTTSCacheIndex
+from .disk_cache import ChimeTTSDiskCache
+from .audio_executor import ChimeTTSAudioExecutor
+from .chime_registry import ChimeTTSChimeRegistry
 from .helpers import ChimeTTSHelper
+from .metrics import ChimeTTSMetrics
+from .mixer import ChimeTTSTimeline, mix_audio, get_audio_format, normalize_audio
 from .queue_manager import ChimeTTSQueueManager
 
 from .const import (
@@ -39,8 +48,15 @@ from .const import (
     SERVICE_SAY,
     SERVICE_SAY_URL,
     SERVICE_CLEAR_CACHE,
+    SERVICE_QUEUE_PURGE,
+    SERVICE_QUEUE_CANCEL,
     VERSION,
     DATA_STORAGE_KEY,
+    CACHE_INDEX_FILENAME,
+    CACHE_KIND_SEGMENT,
+    CACHE_KIND_FINAL,
+    CACHE_KIND_CHIME,
+    CACHE_CLEAR_BATCH_SIZE,
     AUDIO_PATH_KEY,
     AUDIO_DURATION_KEY,
     ROOT_PATH_KEY,
@@ -59,6 +75,47 @@ from .const import (
     MP3_PRESET_CUSTOM_KEY,
     QUEUE_TIMEOUT_KEY,
     QUEUE_TIMEOUT_DEFAULT,
+    QUEUE_CONCURRENCY_KEY,
+    QUEUE_CONCURRENCY_DEFAULT,
+    QUEUE_DEDUPE_WINDOW_KEY,
+    QUEUE_DEDUPE_WINDOW_DEFAULT,
+    QUEUE_RENDER_AHEAD_KEY,
+    QUEUE_RENDER_AHEAD_DEFAULT,
+    QUEUE_MAX_DEPTH_KEY,
+    QUEUE_MAX_DEPTH_DEFAULT,
+    QUEUE_MAX_AGE_KEY,
+    QUEUE_MAX_AGE_DEFAULT,
+    QUEUE_OVERFLOW_POLICY_KEY,
+    QUEUE_OVERFLOW_POLICY_DEFAULT,
+    RENDER_WORKERS_KEY,
+    RENDER_WORKERS_DEFAULT,
+    RENDER_ENGINE_KEY,
+    RENDER_ENGINE_DEFAULT,
+    SEGMENT_FETCH_CONCURRENCY,
+    MEMORY_CACHE_SIZE_KEY,
+    MEMORY_CACHE_SIZE_DEFAULT,
+    DISK_CACHE_SIZE_KEY,
+    DISK_CACHE_SIZE_DEFAULT,
+    TEMP_CACHE_SIZE_KEY,
+    TEMP_CACHE_SIZE_DEFAULT,
+    WWW_CACHE_SIZE_KEY,
+    WWW_CACHE_SIZE_DEFAULT,
+    CHIMES_CACHE_SIZE_KEY,
+    CHIMES_CACHE_SIZE_DEFAULT,
+    CACHE_EVICTION_POLICY_KEY,
+    CACHE_EVICTION_POLICY_DEFAULT,
+    AUDIO_FORMAT_KEY,
+    AUDIO_RENDITIONS_KEY,
+    AUDIO_PASSTHROUGH_KEY,
+    AUDIO_SOURCE_PATH_KEY,
+    AUDIO_SIZE_KEY,
+    AUDIO_SAMPLE_RATE_KEY,
+    AUDIO_SAMPLE_RATE_DEFAULT,
+    AUDIO_CHANNELS_KEY,
+    AUDIO_CHANNELS_DEFAULT,
+    AUDIO_SAMPLE_WIDTH,
+    SPEED_ENGINE_KEY,
+    SPEED_ENGINE_DEFAULT,
     AMAZON_POLLY,
     BAIDU,
     GOOGLE_CLOUD,
@@ -74,13 +131,24 @@ from .const import (
     PIPER,
     VOICE_RSS,
     YANDEX_TTS,
+    METRICS_KEY,
+    METRIC_CACHE_HITS,
+    METRIC_CACHE_MISSES,
 )
 
 _LOGGER = logging.getLogger(__name__)
 _data = {}
 
-helpers = ChimeTTSHelper()
-queue = ChimeTTSQueueManager()
+PLATFORMS = [Platform.SENSOR]
+
+metrics = ChimeTTSMetrics()
+audio_executor = ChimeTTSAudioExecutor(metrics)
+helpers = ChimeTTSHelper(audio_executor)
+chime_registry = ChimeTTSChimeRegistry(helpers, audio_executor)
+memory_cache = ChimeTTSAudioCache(metrics)
+cache_index = ChimeTTSCacheIndex()
+disk_cache = ChimeTTSDiskCache(metrics)
+queue = ChimeTTSQueueManager(metrics)
 
 
 async def async_setup_entry(hass: HomeAssistant, config_entry: ConfigEntry) -> bool:
@@ -88,6 +156,30 @@ async def async_setup_entry(hass: HomeAssistant, config_entry: ConfigEntry) -> b
     await async_refresh_stored_data(hass)
     update_configuration(config_entry, hass)
     queue.set_timeout(_data[QUEUE_TIMEOUT_KEY])
+    queue.set_max_concurrency(_data[QUEUE_CONCURRENCY_KEY])
+    queue.set_dedupe_window(_data[QUEUE_DEDUPE_WINDOW_KEY])
+    queue.set_render_ahead(_data[QUEUE_RENDER_AHEAD_KEY])
+    queue.set_limits(_data[QUEUE_MAX_DEPTH_KEY],
+                     _data[QUEUE_MAX_AGE_KEY],
+                     _data[QUEUE_OVERFLOW_POLICY_KEY])
+    audio_executor.start(hass, config_entry, _data[RENDER_WORKERS_KEY], _data[RENDER_ENGINE_KEY])
+    chime_registry.start(hass, config_entry, _data[MP3_PRESET_CUSTOM_KEY], _data[AUDIO_FORMAT_KEY])
+    memory_cache.clear()
+    memory_cache.set_max_size(_data[MEMORY_CACHE_SIZE_KEY])
+    disk_cache.set_budgets(_data[DISK_CACHE_SIZE_KEY],
+                           {
+                               _data[TEMP_PATH_KEY]: _data[TEMP_CACHE_SIZE_KEY],
+                               _data[WWW_PATH_KEY]: _data[WWW_CACHE_SIZE_KEY],
+                               _data[TEMP_CHIMES_PATH_KEY]: _data[CHIMES_CACHE_SIZE_KEY],
+                           },
+                           _data[CACHE_EVICTION_POLICY_KEY])
+    queue.start(hass, config_entry)
+    config_entry.async_create_background_task(
+        hass, async_maintain_cached_audio(hass), "chime_tts_cache_maintenance"
+    )
+
+    hass.data.setdefault(DOMAIN, {})[METRICS_KEY] = metrics
+    await hass.config_entries.async_forward_entry_setups(config_entry, PLATFORMS)
 
     config_entry.async_on_unload(config_entry.add_update_listener(async_reload_entry))
     return True
@@ -106,7 +198,22 @@ async def async_setup(hass: HomeAssistant, config_entry: ConfigEntry) -> bool:
             _LOGGER.debug("----- Chime TTS Say Called. Version %s -----", VERSION)
 
         # Add service calls to the queue with arguments
-        result = await queue.add_to_queue(async_say_execute,service)
+        targets = helpers.parse_entity_ids(service.data, hass)
+        lanes, unresolved = helpers.get_queue_lanes(service.data, targets, hass)
+        interrupt_event = asyncio.Event()
+        result = await queue.add_to_queue(async_say_execute,
+                                          service,
+                                          interrupt_event,
+                                          targets=lanes,
+                                          exclusive=unresolved,
+                                          priority=helpers.parse_priority(service.data),
+                                          preempt=bool(service.data.get("preempt", False)),
+                                          interrupt_event=interrupt_event,
+                                          render_key=get_render_key(service.data, targets),
+                                          render_function=async_say_render,
+                                          render_args=(service,),
+                                          discard_function=async_say_discard,
+                                          tag=service.data.get("tag", None))
 
         if result is not False:
             return result
@@ -115,34 +222,54 @@ async def async_setup(hass: HomeAssistant, config_entry: ConfigEntry) -> bool:
         return {}
 
 
-    async def async_say_execute(service):
-        """Play TTS audio with local chime MP3 audio."""
+    async def async_say_render(service):
+        """Create the audio for a queued service call (render stage)."""
         start_time = datetime.now()
 
         # Parse service parameters & TTS options
         params = await helpers.async_parse_params(service.data, hass)
         options = helpers.parse_options_yaml(service.data)
 
-        media_players_array = params["media_players_array"]
-
         # Create audio file to play on media player
         audio_dict = await async_get_playback_audio_path(params, options)
+
+        return {
+            "params": params,
+            "audio_dict": audio_dict,
+            "start_time": start_time,
+        }
+
+    async def async_say_discard(rendered):
+        """Cache or delete the audio of a rendered service call removed from the queue before playback."""
+        if rendered["audio_dict"] is not None:
+            await async_cache_generated_audio(hass, rendered["params"], rendered["audio_dict"])
+
+    async def async_say_execute(rendered, service, interrupt_event: asyncio.Event = None):
+        """Play TTS audio with local chime MP3 audio (playback stage)."""
+        params = rendered["params"]
+        audio_dict = rendered["audio_dict"]
+        start_time = rendered["start_time"]
+
         if audio_dict is None or audio_dict[AUDIO_PATH_KEY] is None:
             return False
         _LOGGER.debug(" - audio_dict = %s", str(audio_dict))
         audio_path = audio_dict[AUDIO_PATH_KEY]
         audio_duration = audio_dict[AUDIO_DURATION_KEY]
 
+        # Prepare media players once it is this service call's turn to use them
+        media_players_array = await helpers.async_initialize_media_players(
+            hass, params["entity_ids"], params["volume_level"]
+        )
+
         # Play audio with service_data
-        if media_players_array is not False:
-            play_result = await async_play_media(
+        if interrupt_event is not None and interrupt_event.is_set():
+            _LOGGER.debug("Playback skipped by a higher priority service call")
+        elif media_players_array is not False:
+            play_result = await async_play_renditions(
                 hass,
-                audio_path,
-                params["entity_ids"],
-                params["announce"],
-                params["join_players"],
+                audio_dict,
+                params,
                 media_players_array,
-                params["volume_level"],
             )
             if play_result is True:
                 await async_post_playback_actions(
@@ -152,34 +279,18 @@ async def async_setup(hass: HomeAssistant, config_entry: ConfigEntry) -> bool:
                     media_players_array,
                     params["volume_level"],
                     params["unjoin_players"],
+                    interrupt_event,
                 )
 
         # Save generated temp mp3 file to cache
-        if params["cache"] is True or params["entity_ids"] is None or len(params["entity_ids"])==0:
-            if _data["is_save_generated"] is True:
-                if params["cache"]:
-                    _LOGGER.debug("Saving generated mp3 file to cache")
-                filepath_hash = _data["generated_filename"]
-                await async_store_data(hass, filepath_hash, audio_dict)
-        else:
-            if os.path.exists(audio_path):
-                os.remove(audio_path)
+        await async_cache_generated_audio(hass, params, audio_dict)
 
         end_time = datetime.now()
         elapsed_time = (end_time - start_time).total_seconds() * 1000
 
         # Convert URL to external for chime_tts.say_url
         if params["entity_ids"] is None or len(params["entity_ids"]) == 0:
-            instance_url = hass.config.external_url
-            if instance_url is None:
-                instance_url = str(get_url(hass))
-
-            external_url = (
-                (instance_url + "/" + audio_path)
-                .replace(instance_url + "//", instance_url + "/")
-                .replace("/config", "")
-                .replace("www/", "local/")
-            )
+            external_url = get_external_url(hass, audio_path)
             _LOGGER.debug("Final URL = %s", external_url)
 
             _LOGGER.debug("----- Chime TTS Say URL Completed in %s ms -----", str(elapsed_time))
@@ -241,17 +352,14 @@ async def async_setup(hass: HomeAssistant, config_entry: ConfigEntry) -> bool:
             log_message += "..."
             _LOGGER.debug("%s", log_message)
         else:
-            return
+            return {}
 
 
         # CLEAR CHIME TTS CACHE #
-        cached_dicts = dict(_data[DATA_STORAGE_KEY])
-        for key in cached_dicts:
-            await async_remove_cached_audio_data(hass,
-                                                 str(key),
-                                                 clear_chimes_cache,
-                                                 clear_temp_tts_cache,
-                                                 clear_www_tts_cache)
+        response = await async_clear_cached_audio_data(hass,
+                                                       clear_chimes_cache,
+                                                       clear_temp_tts_cache,
+                                                       clear_www_tts_cache)
 
         # CLEAR HA TTS CACHE #
         if clear_ha_tts_cache:
@@ -266,16 +374,50 @@ async def async_setup(hass: HomeAssistant, config_entry: ConfigEntry) -> bool:
             "----- Chime TTS Clear Cache Completed in %s ms -----", str(elapsed_time)
         )
 
-        return True
+        return response
+
+    hass.services.async_register(DOMAIN,
+                                 SERVICE_CLEAR_CACHE,
+                                 async_clear_cache,
+                                 supports_response=SupportsResponse.OPTIONAL)
+
+    #########################
+    # Queue Purge / Cancel #
+    #########################
 
-    hass.services.async_register(DOMAIN, SERVICE_CLEAR_CACHE, async_clear_cache)
+    async def async_queue_purge(service) -> ServiceResponse:
+        """Remove pending service calls from the queue, optionally filtered by media player and/or tag."""
+        _LOGGER.debug("----- Chime TTS Queue Purge Called -----")
+        removed = queue.purge(helpers.parse_entity_ids(service.data, hass),
+                              service.data.get("tag", None))
+        return {"removed": removed}
+
+    hass.services.async_register(DOMAIN,
+                                 SERVICE_QUEUE_PURGE,
+                                 async_queue_purge,
+                                 supports_response=SupportsResponse.OPTIONAL)
+
+    async def async_queue_cancel(service) -> ServiceResponse:
+        """Remove pending and stop playing service calls, optionally filtered by media player and/or tag."""
+        _LOGGER.debug("----- Chime TTS Queue Cancel Called -----")
+        return queue.cancel(helpers.parse_entity_ids(service.data, hass),
+                            service.data.get("tag", None))
+
+    hass.services.async_register(DOMAIN,
+                                 SERVICE_QUEUE_CANCEL,
+                                 async_queue_cancel,
+                                 supports_response=SupportsResponse.OPTIONAL)
 
     return True
 
 
 async def async_unload_entry(hass: HomeAssistant, config_entry: ConfigEntry) -> bool:
     """Handle removal of an entry."""
-    return True
+    await queue.async_stop()
+    await chime_registry.async_stop()
+    await audio_executor.async_stop()
+    await async_close_stored_data(hass)
+    return await hass.config_entries.async_unload_platforms(config_entry, PLATFORMS)
 
 
 async def async_reload_entry(hass: HomeAssistant, config_entry: ConfigEntry) -> None:
@@ -286,6 +428,23 @@ async def async_reload_entry(hass: HomeAssistant, config_entry: ConfigEntry) ->
     await async_setup(hass, config_entry)
 
 
+async def async_cache_generated_audio(hass: HomeAssistant, params: dict, audio_dict: dict):
+    """Save newly generated audio to the cache, or delete it if it is not to be cached."""
+    if params["cache"] is True or params["entity_ids"] is None or len(params["entity_ids"])==0:
+        if params["is_save_generated"] is True:
+            if params["cache"]:
+                _LOGGER.debug("Saving generated mp3 file to cache")
+            filepath_hash = params["generated_filename"]
+            await async_store_audio_data(hass, filepath_hash, audio_dict, CACHE_KIND_FINAL)
+    else:
+        await async_delete_cached_files(get_audio_dict_paths(audio_dict))
+
+
+def get_audio_dict_paths(audio_dict: dict):
+    """Paths of all audio files for an audio_dict (its audio path and any other renditions)."""
+    return disk_cache.get_paths(audio_dict)
+
+
 async def async_post_playback_actions(
     hass: HomeAssistant,
     audio_duration: float,
@@ -293,15 +452,16 @@ async def async_post_playback_actions(
     media_players_array: list,
     volume_level: float,
     unjoin_players: bool,
+    interrupt_event: asyncio.Event = None,
 ):
     """Run post playback actions."""
     # Wait the audio playback duration
     _LOGGER.debug("Waiting %ss for audio playback to complete...", str(audio_duration))
-    await hass.async_add_executor_job(helpers.sleep, audio_duration)
-    if final_delay > 0:
+    interrupted = await async_wait_for_playback(audio_duration, interrupt_event)
+    if final_delay > 0 and not interrupted:
         final_delay_s = float(final_delay / 1000)
         _LOGGER.debug("Waiting %ss for final_delay to complete...", str(final_delay_s))
-        await hass.async_add_executor_job(helpers.sleep, final_delay_s)
+        await async_wait_for_playback(final_delay_s, interrupt_event)
 
     # Reset media players back to their original states
     entity_ids = []
@@ -321,11 +481,12 @@ async def async_post_playback_actions(
             )
 
     # Unjoin entity_ids
-    if (
-        unjoin_players is True
-        and "joint_media_player_entity_id" in _data
-        and _data["joint_media_player_entity_id"] is not None
-    ):
+    joint_media_player_entity_ids = [
+        media_player_dict.get("joint_media_player_entity_id")
+        for media_player_dict in media_players_array
+        if media_player_dict.get("joint_media_player_entity_id") is not None
+    ]
+    if unjoin_players is True and len(joint_media_player_entity_ids) > 0:
         _LOGGER.debug(" - Calling media_player.unjoin service...")
         for media_player_dict in media_players_array:
             if media_player_dict["group_members_supported"] is True:
@@ -345,6 +506,19 @@ async def async_post_playback_actions(
                     )
 
 
+async def async_wait_for_playback(duration_s: float, interrupt_event: asyncio.Event = None):
+    """Wait for playback to complete. Return True if interrupted by a higher priority service call."""
+    if interrupt_event is None:
+        await asyncio.sleep(duration_s)
+        return False
+    try:
+        await asyncio.wait_for(interrupt_event.wait(), timeout=duration_s)
+    except asyncio.TimeoutError:
+        return False
+    _LOGGER.debug("Playback interrupted by a higher priority service call")
+    return True
+
+
 async def async_join_media_players(hass, entity_ids):
     """Join media players."""
     _LOGGER.debug(
@@ -363,18 +537,18 @@ async def async_join_media_players(hass, entity_ids):
             " - Joining %s media_player entities...", str(len(supported_entity_ids))
         )
         try:
-            _data["joint_media_player_entity_id"] = supported_entity_ids[0]
+            joint_media_player_entity_id = supported_entity_ids[0]
             await hass.services.async_call(
                 domain="media_player",
                 service=SERVICE_JOIN,
                 service_data={
-                    CONF_ENTITY_ID: _data["joint_media_player_entity_id"],
+                    CONF_ENTITY_ID: joint_media_player_entity_id,
                     ATTR_GROUP_MEMBERS: supported_entity_ids,
                 },
                 blocking=True,
             )
             _LOGGER.debug(" - ...done")
-            return _data["joint_media_player_entity_id"]
+            return joint_media_player_entity_id
         except Exception as error:
             _LOGGER.warning("   - Error joining media_player entities: %s", error)
     else:
@@ -400,6 +574,42 @@ async def async_request_tts_audio(
 
     start_time = datetime.now()
 
+    tts_audio_data = await async_get_tts_audio_data(hass, tts_platform, message, language, cache, options)
+    if tts_audio_data is None:
+        return None
+
+    file = io.BytesIO(tts_audio_data[1])
+    audio = await audio_executor.async_run(AudioSegment.from_file, file)
+    if audio is not None:
+        _LOGGER.debug(" - TTS playback speed = %s", str(tts_playback_speed))
+        audio = await audio_executor.async_run_cpu(helpers.change_playback_speed,
+                                                   audio,
+                                                   tts_playback_speed,
+                                                   _data[SPEED_ENGINE_KEY])
+        if audio is not None and get_audio_format(audio) != _data[AUDIO_FORMAT_KEY]:
+            audio = await audio_executor.async_run_cpu(normalize_audio,
+                                                       audio,
+                                                       _data[AUDIO_FORMAT_KEY])
+        end_time = datetime.now()
+        _LOGGER.debug(
+            " - ...TTS audio completed in %s ms",
+            str((end_time - start_time).total_seconds() * 1000),
+        )
+        return audio
+    _LOGGER.error(" - ...could not extract TTS audio from file")
+    return None
+
+
+async def async_get_tts_audio_data(
+    hass: HomeAssistant,
+    tts_platform: str,
+    message: str,
+    language: str,
+    cache: bool,
+    options: dict,
+):
+    """Send an API request for TTS audio and return its media source ID and audio bytes."""
+
     # Data validation
 
     tts_options = options.copy() if isinstance(options, dict) else (str(options) if isinstance(options, str) else options)
@@ -439,11 +649,10 @@ async def async_request_tts_audio(
     if "gender" in tts_options and tts_platform not in [NABU_CASA_CLOUD_TTS]:
         del tts_options["gender"]
 
-    _LOGGER.debug("async_request_tts_audio(%s)",
+    _LOGGER.debug("async_get_tts_audio_data(%s)",
         "tts_platform='" + tts_platform
         + "', message='" + str(message)
-        + "', tts_playback_speed=" + str(tts_playback_speed)
-        + ", cache=" + str(use_cache)
+        + "', cache=" + str(use_cache)
         + ", language=" + ("'" + str(language) + "'" if language is not None else "None")
         + ", options=" + str(tts_options)
     )
@@ -484,32 +693,7 @@ async def async_request_tts_audio(
 
     if audio_data is not None:
         if len(audio_data) == 2:
-            audio_bytes = audio_data[1]
-            file = io.BytesIO(audio_bytes)
-            if file is None:
-                _LOGGER.error(" - ...could not convert TTS bytes to audio")
-                return None
-            audio = AudioSegment.from_file(file)
-            if audio is not None:
-                if tts_playback_speed != 100:
-                    _LOGGER.debug(
-                        " -  ...changing TTS playback speed to %s percent",
-                        str(tts_playback_speed),
-                    )
-                    playback_speed = float(tts_playback_speed / 100)
-                    if tts_playback_speed > 150:
-                        audio = audio.speedup(
-                            playback_speed=playback_speed, chunk_size=50
-                        )
-                    else:
-                        audio = audio.speedup(playback_speed=playback_speed)
-                end_time = datetime.now()
-                _LOGGER.debug(
-                    " - ...TTS audio completed in %s ms",
-                    str((end_time - start_time).total_seconds() * 1000),
-                )
-                return audio
-            _LOGGER.error(" - ...could not extract TTS audio from file")
+            return media_source_id, audio_data[1]
         else:
             _LOGGER.error(" - ...audio_data did not contain audio bytes")
     else:
@@ -573,11 +757,19 @@ async def async_get_playback_audio_path(params: dict, options: dict):
     cache = params["cache"]
     entity_ids = params["entity_ids"]
     ffmpeg_args = params["ffmpeg_args"]
-    _data["is_save_generated"] = False
+    renditions = helpers.get_renditions(params["output_profiles"]) if params.get("output_profiles") else {}
+    if len(renditions) == 1:
+        ffmpeg_args = next(iter(renditions)) or None
+    params["is_save_generated"] = False
     _LOGGER.debug("async_get_playback_audio_path")
 
     filepath_hash = get_filename_hash_from_service_data({**params}, {**options})
-    _data["generated_filename"] = filepath_hash
+    params["generated_filename"] = filepath_hash
+
+    # Play the TTS platform's audio as is, when there is nothing to render
+    audio_dict = await async_get_passthrough_audio(params, options)
+    if audio_dict is not None:
+        return audio_dict
 
     # Load previously generated audio from cache
     if cache is True:
@@ -586,13 +778,18 @@ async def async_get_playback_audio_path(params: dict, options: dict):
         if audio_dict is not None:
             filepath = audio_dict[AUDIO_PATH_KEY]
             audio_duration = audio_dict[AUDIO_DURATION_KEY]
-            if filepath is not None and audio_duration > 0:
-                if os.path.exists(str(filepath)):
+            if len(renditions) > 1 and not set(renditions).issubset(audio_dict.get(AUDIO_RENDITIONS_KEY) or {}):
+                _LOGGER.debug(" - Previously generated mp3 file does not include all audio renditions")
+            elif filepath is not None and audio_duration is not None and audio_duration > 0:
+                if await audio_executor.async_run(os.path.exists, str(filepath)):
                     _LOGGER.debug("Using previously generated mp3 saved in cache")
+                    await async_touch_cached_audio(hass, filepath_hash)
+                    metrics.increment(METRIC_CACHE_HITS)
                     return audio_dict
                 _LOGGER.warning("Could not find previosuly cached generated mp3 file")
         else:
             _LOGGER.debug(" - No previously generated mp3 file found")
+        metrics.increment(METRIC_CACHE_MISSES)
 
     ######################
     # Generate new audio #
@@ -624,34 +821,67 @@ async def async_get_playback_audio_path(params: dict, options: dict):
 
         # Save MP3 file
         _LOGGER.debug(" - Saving mp3 file...")
-        if entity_ids and len(entity_ids) > 0:
-            # Use the temp folder path
-            new_audio_folder = _data[TEMP_PATH_KEY]
-        else:
-            # Use the public folder path (i.e chime_tts.say_url service calls)
-            new_audio_folder = _data[WWW_PATH_KEY]
-
-        new_audio_full_path = helpers.save_audio_to_folder(output_audio, new_audio_folder)
+        # Audio is stored once, by its content, in the temp folder. Audio deleted
+        # after playback gets a file of its own, as another service call
+        # rendering identical audio may still be playing a shared file.
+        new_audio_folder = _data[TEMP_PATH_KEY]
+        content_addressed = cache is True or entity_ids is None or len(entity_ids) == 0
+
+        new_audio_full_path = None
+        rendition_paths = None
+
+        # Encode each media player's rendition with a single FFmpeg process
+        if len(renditions) > 1:
+            _LOGGER.debug("  - Performing FFmpeg audio conversion for %s renditions...", len(renditions))
+            file_paths = await helpers.async_ffmpeg_convert_to_files(output_audio,
+                                                                     list(renditions),
+                                                                     new_audio_folder,
+                                                                     content_addressed)
+            if file_paths is not None:
+                _LOGGER.debug("  - ...FFmpeg audio conversion completed.")
+                rendition_paths = dict(zip(renditions, file_paths))
+                new_audio_full_path = rendition_paths.get(ffmpeg_args or "", file_paths[0])
+            else:
+                _LOGGER.warning("  - ...FFmpeg audio conversion failed. Using unconverted audio file")
 
-        # Perform FFmpeg conversion
-        if ffmpeg_args:
+        # Perform FFmpeg conversion, encoding straight to the output file
+        elif ffmpeg_args:
             _LOGGER.debug("  - Performing FFmpeg audio conversion...")
-            converted_output_audio = helpers.ffmpeg_convert_from_file(new_audio_full_path,
-                                                                      ffmpeg_args)
-            if converted_output_audio is not False:
+            new_audio_full_path = await helpers.async_ffmpeg_convert_to_file(output_audio,
+                                                                             ffmpeg_args,
+                                                                             new_audio_folder,
+                                                                             content_addressed)
+            if new_audio_full_path is not None:
                 _LOGGER.debug("  - ...FFmpeg audio conversion completed.")
-                new_audio_full_path = converted_output_audio
             else:
                 _LOGGER.warning("  - ...FFmpeg audio conversion failed. Using unconverted audio file")
 
-        _LOGGER.debug("  - Filepath = '%s'", new_audio_full_path)
-        _data["is_save_generated"] = True
+        if new_audio_full_path is None:
+            new_audio_full_path = await audio_executor.async_run(helpers.save_audio_to_folder,
+                                                                 output_audio,
+                                                                 new_audio_folder,
+                                                                 None,
+                                                                 content_addressed)
 
+        _LOGGER.debug("  - Filepath = '%s'", new_audio_full_path)
+        params["is_save_generated"] = True
+
+        # Link the audio into the public folder (i.e chime_tts.say_url service calls)
+        source_audio_full_path = None
+        if (entity_ids is None or len(entity_ids) == 0) and new_audio_full_path is not None:
+            source_audio_full_path = new_audio_full_path
+            new_audio_full_path = await audio_executor.async_run(helpers.link_file,
+                                                                 source_audio_full_path,
+                                                                 _data[WWW_PATH_KEY],
+                                                                 _data[TEMP_PATH_KEY])
+            _LOGGER.debug("  - Public filepath = '%s'", new_audio_full_path)
 
         # Check URL (chime_tts.say_url)
         if entity_ids is None or len(entity_ids) == 0:
             relative_path = new_audio_full_path
-            new_audio_full_path = helpers.validate_path(hass, new_audio_full_path)
+            new_audio_full_path = await audio_executor.async_run(helpers.validate_path,
+                                                                 hass,
+                                                                 new_audio_full_path)
             if relative_path != new_audio_full_path:
                 _LOGGER.debug("  - Non-relative filepath = '%s'", new_audio_full_path)
 
@@ -662,13 +892,14 @@ async def async_get_playback_audio_path(params: dict, options: dict):
 
         # Valdiation
         audio_dict = {AUDIO_PATH_KEY: new_audio_full_path, AUDIO_DURATION_KEY: duration}
-        if audio_dict[AUDIO_DURATION_KEY] == 0:
+        if rendition_paths is not None:
+            audio_dict[AUDIO_RENDITIONS_KEY] = rendition_paths
+        if source_audio_full_path is not None:
+            audio_dict[AUDIO_SOURCE_PATH_KEY] = source_audio_full_path
+        if not audio_dict[AUDIO_DURATION_KEY]:
             _LOGGER.error("async_get_playback_audio_path --> Audio has no duration")
             audio_dict = None
-        if audio_dict[AUDIO_DURATION_KEY] == 0:
-            _LOGGER.error("async_get_playback_audio_path --> Audio has no duration")
-            audio_dict = None
-        if audio_dict[AUDIO_PATH_KEY] is not None and len(audio_dict[AUDIO_PATH_KEY]) == 0:
+        elif audio_dict[AUDIO_PATH_KEY] is not None and len(audio_dict[AUDIO_PATH_KEY]) == 0:
             _LOGGER.error(
                 "async_get_playback_audio_path --> Audio has no file path data"
             )
@@ -679,10 +910,62 @@ async def async_get_playback_audio_path(params: dict, options: dict):
     return None
 
 
-def get_segment_offset(output_audio, segment, params):
+async def async_get_passthrough_audio(params: dict, options: dict):
+    """Audio dict for the TTS platform's own audio when the message needs no rendering (or None)."""
+    segments = helpers.parse_message(params["message"])
+    if (not params["entity_ids"]
+            or len(segments) != 1
+            or set(segments[0]) != {"type", "message"}
+            or segments[0]["type"] != "tts"
+            or params["chime_path"] not in ["", "None"]
+            or params["end_chime_path"] not in ["", "None"]
+            or float(params["tts_playback_speed"]) != 100
+            or params["ffmpeg_args"]
+            or any((params.get("output_profiles") or {}).values())):
+        return None
+
+    _LOGGER.debug(" - Message needs no rendering. Using TTS platform audio...")
+    tts_audio_data = await async_get_tts_audio_data(params["hass"],
+                                                    params["tts_platform"],
+                                                    segments[0]["message"],
+                                                    params["language"],
+                                                    params["cache"],
+                                                    options)
+    if tts_audio_data is None:
+        return None
+    media_source_id, audio_bytes = tts_audio_data
+
+    duration = await audio_executor.async_run(helpers.get_audio_duration, audio_bytes)
+    if duration is None:
+        _LOGGER.debug(" - ...unable to read TTS audio duration. Rendering audio instead")
+        return None
+    _LOGGER.debug(" - ...TTS audio duration: %ss", str(duration))
+
+    return {
+        AUDIO_PATH_KEY: media_source_id,
+        AUDIO_DURATION_KEY: duration,
+        AUDIO_PASSTHROUGH_KEY: True,
+    }
+
+
+def get_external_url(hass: HomeAssistant, audio_path: str):
+    """Public URL to an audio file saved in the www folder."""
+    instance_url = hass.config.external_url
+    if instance_url is None:
+        instance_url = str(get_url(hass))
+
+    return (
+        (instance_url + "/" + audio_path)
+        .replace(instance_url + "//", instance_url + "/")
+        .replace("/config", "")
+        .replace("www/", "local/")
+    )
+
+
+def get_segment_offset(has_audio: bool, segment, params):
     """Offset value for segment."""
     segment_offset = 0
-    if output_audio is not None:
+    if has_audio:
         # Get "offset" parameter
         if "offset" in segment:
             segment_offset = segment["offset"]
@@ -705,130 +988,242 @@ async def async_process_segments(hass, message, output_audio, params, options):
     if segments is None or len(segments) == 0:
         return output_audio
 
-    for index, segment in enumerate(segments):
+    # Fetch the audio for all segments concurrently
+    semaphore = asyncio.Semaphore(SEGMENT_FETCH_CONCURRENCY)
+    segments_audio = await asyncio.gather(
+        *[
+            async_get_segment_audio(hass, index, segment, params, options, semaphore)
+            for index, segment in enumerate(segments)
+        ]
+    )
+
+    # Place the audio on a timeline in segment order
+    timeline = ChimeTTSTimeline()
+    timeline.add(output_audio)
+    for segment, segment_audio in zip(segments, segments_audio):
+        # Skip empty TTS messages
+        if segment["type"] == "tts" and segment.get("message") == "None":
+            continue
+
+        if segment["type"] == "delay" and "length" in segment:
+            timeline.add_silence(float(segment["length"]))
+        elif segment_audio is not None:
+            segment_offset = get_segment_offset(not timeline.is_empty, segment, params)
+            timeline.add(segment_audio, segment_offset)
+
+    # Mix all segments into a single buffer
+    return await audio_executor.async_run_cpu(mix_audio, *timeline.get_clips())
+
+
+async def async_get_segment_audio(hass: HomeAssistant,
+                                  index: int,
+                                  segment: dict,
+                                  params: dict,
+                                  options: dict,
+                                  semaphore: asyncio.Semaphore):
+    """Audio for a single message segment (or None), limited by the semaphore to cap concurrent requests."""
+    async with semaphore:
         segment_cache = segment["cache"] if "cache" in segment else params["cache"]
-        segment_audio_conversion = segment["audio_conversion"] if "audio_conversion" in segment else None
-        segment_offset = get_segment_offset(output_audio, segment, params)
-
-        # Chime tag
-        if segment["type"] == "chime":
-            if "path" in segment:
-                output_audio = await async_get_audio_from_path(hass=hass,
-                                                               filepath=segment["path"],
-                                                               cache=segment_cache,
-                                                               offset=segment_offset,
-                                                               audio=output_audio)
-            else:
-                _LOGGER.warning("Chime path missing from messsage segment #%s", str(index+1))
+        segment_audio = await async_get_segment_source_audio(hass, index, segment, segment_cache, params, options)
+
+        # Audio Conversion with FFmpeg (of this segment's audio only)
+        ffmpeg_args = helpers.parse_ffmpeg_args(segment.get("audio_conversion", None))
+        if segment_audio is not None and ffmpeg_args is not None:
+            segment_audio = await async_get_converted_segment_audio(hass,
+                                                                    segment_audio,
+                                                                    ffmpeg_args,
+                                                                    get_segment_hash(segment, params, options),
+                                                                    segment_cache)
+        return segment_audio
+
+
+async def async_get_segment_source_audio(hass: HomeAssistant,
+                                         index: int,
+                                         segment: dict,
+                                         segment_cache: bool,
+                                         params: dict,
+                                         options: dict):
+    """Chime or TTS audio for a single message segment (or None), before any audio conversion."""
+    # Chime tag
+    if segment["type"] == "chime":
+        if "path" in segment:
+            return await async_get_audio_from_path(hass=hass,
+                                                   filepath=segment["path"],
+                                                   cache=segment_cache)
+        _LOGGER.warning("Chime path missing from messsage segment #%s", str(index+1))
+
+    # Delay tag (added to the timeline as silence)
+    if segment["type"] == "delay" and "length" not in segment:
+        _LOGGER.warning("Delay length missing from messsage segment #%s", str(index+1))
+
+    # Request TTS audio file
+    if segment["type"] == "tts":
+        if "message" in segment and len(segment["message"]) > 0:
+            if segment["message"] == "None":
+                return None
+            tts_audio = await async_get_segment_tts_audio(hass, segment, segment_cache, params, options)
+            if tts_audio is None:
+                _LOGGER.warning("Error generating TTS audio from messsage segment #%s: %s",
+                                str(index+1), str(segment))
+            return tts_audio
+        _LOGGER.warning("TTS message missing from messsage segment #%s: %s",
+                        str(index+1), str(segment))
 
-        # Delay tag
-        if segment["type"] == "delay":
-            if "length" in segment:
-                segment_delay_length = float(segment["length"])
-                output_audio = output_audio + AudioSegment.silent(duration=segment_delay_length)
-            else:
-                _LOGGER.warning("Delay length missing from messsage segment #%s", str(index+1))
-
-        # Request TTS audio file
-        if segment["type"] == "tts":
-            if "message" in segment and len(segment["message"]) > 0:
-                segment_message = segment["message"]
-                if len(segment_message) == 0 or segment_message == "None":
-                    continue
-
-                segment_tts_platform = segment["tts_platform"] if "tts_platform" in segment else params["tts_platform"]
-                segment_language = segment["language"] if "language" in segment else params["language"]
-                segment_tts_playback_speed = segment["tts_playback_speed"] if "tts_playback_speed" in segment else params["tts_playback_speed"]
-
-                # Use exposed parameters if not present in the options dictionary
-                segment_options = segment["options"] if "options" in segment else {}
-                exposed_option_keys = ["gender", "tld", "voice"]
-                for exposed_option_key in exposed_option_keys:
-                    value = None
-                    if exposed_option_key in segment_options:
-                        value = segment_options[exposed_option_key]
-                    elif exposed_option_key in segment:
-                        value = segment[exposed_option_key]
-                    if value is not None:
-                        segment_options[exposed_option_key] = value
-
-                for key, value in options.items():
-                    if key not in segment_options:
-                        segment_options[key] = value
-                segment_params = {
-                    "message": segment_message,
-                    "tts_platform": segment_tts_platform,
-                    "language": segment_language,
-                    "cache": segment_cache,
-                    "tts_playback_speed": segment_tts_playback_speed
-                }
-                segment_filepath_hash = get_filename_hash_from_service_data({**segment_params}, {**segment_options}, )
-
-                tts_audio = None
-
-                # Use cached TTS audio
-                if segment_cache is True:
-                    _LOGGER.debug(" - Attempting to retrieve TTS file from cache...")
-                    audio_dict = await async_get_cached_audio_data(hass, segment_filepath_hash)
-                    if audio_dict is not None:
-                        tts_audio = await async_get_audio_from_path(hass=hass,
-                                                                    filepath=audio_dict[AUDIO_PATH_KEY],
-                                                                    cache=segment_cache,
-                                                                    audio=None)
-
-                        tts_audio_duration = audio_dict[AUDIO_DURATION_KEY]
-                        _LOGGER.debug(" - ...cached TTS file retrieved with duration: %ss", str(tts_audio_duration))
-                    else:
-                        _LOGGER.debug(" - ...cached TTS file not found")
-
-
-                # Generate new TTS audio
-                if tts_audio is None:
-                    tts_audio = await async_request_tts_audio(
-                        hass=hass,
-                        tts_platform=segment_tts_platform,
-                        message=segment_message,
-                        language=segment_language,
-                        cache=segment_cache,
-                        options=segment_options,
-                        tts_playback_speed=segment_tts_playback_speed,
-                    )
+    return None
 
 
-                # Combine audio
-                if tts_audio is not None:
-                    tts_audio_duration = float(len(tts_audio) / 1000.0)
-                    output_audio = helpers.combine_audio(output_audio, tts_audio, segment_offset)
-
-                    # Cache the new TTS audio?
-                    if segment_cache is True and audio_dict is None:
-                        _LOGGER.debug("Saving generated TTS audio to cache")
-                        tts_audio_full_path = helpers.save_audio_to_folder(
-                            tts_audio, _data[TEMP_PATH_KEY])
-                        if tts_audio_full_path is not None:
-                            audio_dict = {
-                                AUDIO_PATH_KEY: tts_audio_full_path,
-                                AUDIO_DURATION_KEY: tts_audio_duration
-                            }
-                            await async_store_data(hass, segment_filepath_hash, audio_dict)
-
-                        else:
-                            _LOGGER.warning("Unable to save generated TTS audio to cache")
-
-                else:
-                    _LOGGER.warning("Error generating TTS audio from messsage segment #%s: %s",
-                                    str(index+1), str(segment))
-            else:
-                _LOGGER.warning("TTS message missing from messsage segment #%s: %s",
-                                str(index+1), str(segment))
+def get_segment_tts_params(segment: dict, segment_cache: bool, params: dict, options: dict):
+    """TTS parameters and options for a message segment, inheriting the service call's values."""
+    segment_params = {
+        "message": segment["message"],
+        "tts_platform": segment["tts_platform"] if "tts_platform" in segment else params["tts_platform"],
+        "language": segment["language"] if "language" in segment else params["language"],
+        "cache": segment_cache,
+        "tts_playback_speed": segment["tts_playback_speed"] if "tts_playback_speed" in segment else params["tts_playback_speed"]
+    }
+
+    # Use exposed parameters if not present in the options dictionary
+    segment_options = dict(segment["options"]) if "options" in segment else {}
+    exposed_option_keys = ["gender", "tld", "voice"]
+    for exposed_option_key in exposed_option_keys:
+        value = None
+        if exposed_option_key in segment_options:
+            value = segment_options[exposed_option_key]
+        elif exposed_option_key in segment:
+            value = segment[exposed_option_key]
+        if value is not None:
+            segment_options[exposed_option_key] = value
+
+    for key, value in options.items():
+        if key not in segment_options:
+            segment_options[key] = value
+
+    return segment_params, segment_options
+
+
+def get_segment_hash(segment: dict, params: dict, options: dict):
+    """Hash identifying the audio of a chime or TTS message segment."""
+    if segment["type"] == "tts":
+        segment_params, segment_options = get_segment_tts_params(segment, None, params, options)
+        return get_filename_hash_from_service_data(segment_params, segment_options)
+    return helpers.get_hash_for_string(str(segment.get("path", "")))
+
+
+async def async_get_segment_tts_audio(hass: HomeAssistant,
+                                      segment: dict,
+                                      segment_cache: bool,
+                                      params: dict,
+                                      options: dict):
+    """TTS audio for a message segment, from the cache or the TTS platform."""
+    segment_params, segment_options = get_segment_tts_params(segment, segment_cache, params, options)
+    segment_filepath_hash = get_filename_hash_from_service_data({**segment_params}, {**segment_options}, )
+
+    tts_audio = None
+    audio_dict = None
+
+    # Use cached TTS audio
+    if segment_cache is True:
+        tts_audio = memory_cache.get(segment_filepath_hash)
+        if tts_audio is not None:
+            _LOGGER.debug(" - TTS audio retrieved from memory cache")
+            await async_touch_cached_audio(hass, segment_filepath_hash)
+            metrics.increment(METRIC_CACHE_HITS)
+            return tts_audio
+
+        _LOGGER.debug(" - Attempting to retrieve TTS file from cache...")
+        audio_dict = await async_get_cached_audio_data(hass, segment_filepath_hash)
+
+        # Discard cached audio created in a different audio format, without decoding it
+        if audio_dict is not None and audio_dict.get(AUDIO_FORMAT_KEY) != _data[AUDIO_FORMAT_KEY]:
+            _LOGGER.debug(" - ...cached TTS file format differs from the configured audio format")
+            await async_update_stored_data(hass, removals=[segment_filepath_hash])
+            await async_delete_cached_files(get_audio_dict_paths(audio_dict))
+            audio_dict = None
+        elif audio_dict is not None:
+            tts_audio = await async_get_audio_from_path(hass=hass,
+                                                        filepath=audio_dict[AUDIO_PATH_KEY],
+                                                        cache=segment_cache,
+                                                        audio=None)
+            memory_cache.put(segment_filepath_hash, tts_audio)
+            _LOGGER.debug(" - ...cached TTS file retrieved with duration: %ss",
+                          str(audio_dict[AUDIO_DURATION_KEY]))
+            await async_touch_cached_audio(hass, segment_filepath_hash)
+        else:
+            _LOGGER.debug(" - ...cached TTS file not found")
+        metrics.increment(METRIC_CACHE_HITS if tts_audio is not None else METRIC_CACHE_MISSES)
 
-        # Audio Conversion with FFmpeg
-        if segment_audio_conversion is not None:
-            _LOGGER.debug("Converting audio segment with FFmpeg...")
-            temp_folder = _data[TEMP_PATH_KEY]
-            output_audio = helpers.ffmpeg_convert_from_audio_segment(output_audio, segment_audio_conversion, temp_folder)
+    # Generate new TTS audio
+    if tts_audio is None:
+        tts_audio = await async_request_tts_audio(
+            hass=hass,
+            tts_platform=segment_params["tts_platform"],
+            message=segment_params["message"],
+            language=segment_params["language"],
+            cache=segment_cache,
+            options=segment_options,
+            tts_playback_speed=segment_params["tts_playback_speed"],
+        )
 
-    return output_audio
+    # Cache the new TTS audio?
+    if tts_audio is not None and segment_cache is True and audio_dict is None:
+        _LOGGER.debug("Saving generated TTS audio to cache")
+        audio_dict = await async_save_segment_audio_to_cache(hass, segment_filepath_hash, tts_audio)
+        if audio_dict is None:
+            _LOGGER.warning("Unable to save generated TTS audio to cache")
+
+    return tts_audio
+
+
+async def async_get_converted_segment_audio(hass: HomeAssistant,
+                                            segment_audio: AudioSegment,
+                                            ffmpeg_args: str,
+                                            segment_hash: str,
+                                            segment_cache: bool):
+    """Segment audio converted with FFmpeg, cached under the segment's hash and the FFmpeg arguments."""
+    conversion_hash = helpers.get_hash_for_string(segment_hash + "-" + ffmpeg_args)
+
+    # Use cached converted audio
+    if segment_cache is True:
+        converted_audio = memory_cache.get(conversion_hash)
+        if converted_audio is not None:
+            _LOGGER.debug(" - Converted segment audio retrieved from memory cache")
+            await async_touch_cached_audio(hass, conversion_hash)
+            return converted_audio
+        audio_dict = await async_get_cached_audio_data(hass, conversion_hash)
+        if audio_dict is not None:
+            converted_audio = await async_get_audio_from_path(hass=hass,
+                                                              filepath=audio_dict[AUDIO_PATH_KEY],
+                                                              cache=segment_cache)
+            if converted_audio is not None:
+                _LOGGER.debug(" - Converted segment audio retrieved from cache")
+                await async_touch_cached_audio(hass, conversion_hash)
+                memory_cache.put(conversion_hash, converted_audio)
+                return converted_audio
+
+    _LOGGER.debug("Converting audio segment with FFmpeg...")
+    converted_audio = await helpers.async_ffmpeg_convert_audio_segment(segment_audio, ffmpeg_args)
+
+    # Cache the converted audio
+    if segment_cache is True and converted_audio is not segment_audio:
+        await async_save_segment_audio_to_cache(hass, conversion_hash, converted_audio)
+
+    return converted_audio
+
+
+async def async_save_segment_audio_to_cache(hass: HomeAssistant, filepath_hash: str, audio: AudioSegment):
+    """Save segment audio to the cache folder and the memory cache, returning its audio_dict."""
+    audio_full_path = await audio_executor.async_run(
+        helpers.save_audio_to_folder, audio, _data[TEMP_PATH_KEY])
+    if audio_full_path is None:
+        return None
+    audio_dict = {
+        AUDIO_PATH_KEY: audio_full_path,
+        AUDIO_DURATION_KEY: float(len(audio) / 1000.0),
+        AUDIO_FORMAT_KEY: get_audio_format(audio),
+    }
+    await async_store_audio_data(hass, filepath_hash, audio_dict, CACHE_KIND_SEGMENT)
+    memory_cache.put(filepath_hash, audio)
+    return audio_dict
 
 async def async_get_audio_from_path(hass: HomeAssistant,
                                     filepath: str,
@@ -839,6 +1234,15 @@ async def async_get_audio_from_path(hass: HomeAssistant,
     if filepath is None or filepath == "None" or len(filepath) == 0:
         return audio
 
+    # Use pre-decoded preset/custom chime audio
+    audio_from_path = chime_registry.get_audio(filepath)
+    if audio_from_path is not None:
+        _LOGGER.debug('Retrieving audio from chime registry: "%s"', filepath)
+        return await audio_executor.async_run_cpu(helpers.combine_audio,
+                                                  audio,
+                                                  audio_from_path,
+                                                  offset)
+
     # Load/download audio file & validate local path
     # await async_refresh_stored_data(hass)
     filepath = await helpers.async_get_chime_path(
@@ -847,10 +1251,18 @@ async def async_get_audio_from_path(hass: HomeAssistant,
         data=_data,
         hass=hass)
 
+    # Track downloaded chimes in the cache
+    if filepath is not None and filepath.startswith(_data[TEMP_CHIMES_PATH_KEY]):
+        await async_track_downloaded_chime(hass, filepath)
+
     if filepath is not None:
         _LOGGER.debug('Retrieving audio from path: "%s"', filepath)
         try:
-            audio_from_path = AudioSegment.from_file(filepath)
+            audio_from_path = await audio_executor.async_run(AudioSegment.from_file, filepath)
+            if audio_from_path is not None and get_audio_format(audio_from_path) != _data[AUDIO_FORMAT_KEY]:
+                audio_from_path = await audio_executor.async_run_cpu(normalize_audio,
+                                                                     audio_from_path,
+                                                                     _data[AUDIO_FORMAT_KEY])
             if audio_from_path is not None:
                 duration = float(len(audio_from_path) / 1000.0)
                 _LOGGER.debug(
@@ -861,7 +1273,10 @@ async def async_get_audio_from_path(hass: HomeAssistant,
                     return audio_from_path
 
                 # Apply offset
-                return helpers.combine_audio(audio, audio_from_path, offset)
+                return await audio_executor.async_run_cpu(helpers.combine_audio,
+                                                          audio,
+                                                          audio_from_path,
+                                                          offset)
             _LOGGER.warning("Unable to find audio at filepath: %s", filepath)
         except Exception as error:
             _LOGGER.warning('Unable to extract audio from file: "%s"', error)
@@ -915,6 +1330,44 @@ async def async_set_volume_level(
     return False
 
 
+async def async_play_renditions(
+    hass: HomeAssistant,
+    audio_dict: dict,
+    params: dict,
+    media_players_array,
+):
+    """Play audio on the media players, with each media player's own rendition (if any)."""
+    rendition_paths = audio_dict.get(AUDIO_RENDITIONS_KEY, None)
+    if not rendition_paths or not params.get("output_profiles"):
+        return await async_play_media(
+            hass,
+            audio_dict[AUDIO_PATH_KEY],
+            params["entity_ids"],
+            params["announce"],
+            params["join_players"],
+            media_players_array,
+            params["volume_level"],
+        )
+
+    play_calls = []
+    for ffmpeg_args, entity_ids in helpers.get_renditions(params["output_profiles"]).items():
+        rendition_media_players = [media_player_dict for media_player_dict in media_players_array
+                                   if media_player_dict["entity_id"] in entity_ids]
+        if len(rendition_media_players) == 0:
+            continue
+        play_calls.append(async_play_media(
+            hass,
+            rendition_paths.get(ffmpeg_args, audio_dict[AUDIO_PATH_KEY]),
+            entity_ids,
+            params["announce"],
+            params["join_players"] and len(rendition_media_players) > 1,
+            rendition_media_players,
+            params["volume_level"],
+        ))
+    play_results = await asyncio.gather(*play_calls)
+    return True in play_results
+
+
 async def async_play_media(
     hass: HomeAssistant,
     audio_path,
@@ -934,7 +1387,7 @@ async def async_play_media(
     media_source_path = audio_path
     media_folder = "/media/"
     media_folder_path_index = media_source_path.find(media_folder)
-    if media_folder_path_index != -1:
+    if media_folder_path_index != -1 and not media_source_path.startswith("media-source://"):
         media_path = media_source_path[media_folder_path_index + len(media_folder) :].replace("//", "/")
         media_source_path = "media-source://media_source/<media_dir>/<media_path>".replace(
             "<media_dir>", _data[MEDIA_DIR_KEY]
@@ -955,6 +1408,9 @@ async def async_play_media(
             joint_speakers_entity_id = await async_join_media_players(hass, entity_ids)
             if joint_speakers_entity_id is not False:
                 service_data[CONF_ENTITY_ID] = joint_speakers_entity_id
+                # Remember the group for this service call's post playback unjoin
+                for media_player_dict in media_players_array:
+                    media_player_dict["joint_media_player_entity_id"] = joint_speakers_entity_id
             else:
                 _LOGGER.warning(
                     "Unable to join speakers. Only 1 media_player supported."
@@ -1016,33 +1472,124 @@ async def async_play_media(
 ################################
 
 async def async_refresh_stored_data(hass: HomeAssistant):
-    """Refresh the stored data of the integration."""
+    """Open the integration's cache index, moving any stored data from the previous JSON store into it."""
+    await cache_index.async_run(cache_index.open, hass.config.path(CACHE_INDEX_FILENAME))
     store = storage.Store(hass, 1, DATA_STORAGE_KEY)
-    _data[DATA_STORAGE_KEY] = await store.async_load()
-    if _data[DATA_STORAGE_KEY] is None:
-        _data[DATA_STORAGE_KEY] = {}
+    stored_data = await store.async_load()
+    if stored_data is not None:
+        imported_count = await cache_index.async_run(cache_index.import_entries, stored_data)
+        await store.async_remove()
+        _LOGGER.debug("Moved %s cached audio entries from the JSON store to the cache index", str(imported_count))
 
 
-async def async_store_data(hass: HomeAssistant, key: str, value: str):
+async def async_store_data(hass: HomeAssistant, key: str, value: str, kind: str = None):
     """Store a key/value pair in the integration's stored data."""
     _LOGGER.debug("Saving to chime_tts storage:")
     _LOGGER.debug(' - key:   "%s"', key)
     _LOGGER.debug(' - value: "%s"', value)
-    _data[DATA_STORAGE_KEY][key] = value
-    await async_save_data(hass)
+    await async_update_stored_data(hass, updates={key: value}, kind=kind)
 
 
-async def async_retrieve_data(key: str):
-    """Retrieve a value from the integration's stored data based on the provided key."""
-    if key in _data[DATA_STORAGE_KEY]:
-        return _data[DATA_STORAGE_KEY][key]
-    return None
+async def async_update_stored_data(hass: HomeAssistant, updates: dict = None, removals: list = None, kind: str = None):
+    """Add/replace and remove many key/value pairs in the integration's stored data in a single transaction."""
+    if updates or removals:
+        await cache_index.async_update(updates, removals, kind)
 
 
-async def async_save_data(hass: HomeAssistant):
-    """Save the provided data to the integration's stored data."""
-    store = storage.Store(hass, 1, DATA_STORAGE_KEY)
-    await store.async_save(_data[DATA_STORAGE_KEY])
+async def async_retrieve_data(key: str):
+    """Retrieve a value from the integration's stored data based on the provided key."""
+    return await cache_index.async_run(cache_index.get, key)
+
+
+async def async_close_stored_data(hass: HomeAssistant):
+    """Close the integration's cache index."""
+    await cache_index.async_close()
+
+
+async def async_store_audio_data(hass: HomeAssistant, filepath_hash: str, audio_dict: dict, kind: str):
+    """Store cached audio data with the size of its files and its access time, then enforce the disk cache budgets."""
+    file_sizes = await audio_executor.async_run(helpers.get_file_sizes, get_audio_dict_paths(audio_dict))
+    audio_dict[AUDIO_SIZE_KEY] = sum(file_sizes.values())
+    disk_cache.touch(audio_dict)
+    await async_store_data(hass, filepath_hash, audio_dict, kind)
+    await async_evict_cached_audio(hass)
+
+
+async def async_touch_cached_audio(hass: HomeAssistant, filepath_hash: str):
+    """Record an access of cached audio, for the disk cache eviction policy."""
+    cache_index.record_access(filepath_hash)
+
+
+async def async_track_downloaded_chime(hass: HomeAssistant, filepath: str):
+    """Add a downloaded chime file to the cache, or record an access of it."""
+    filepath_hash = helpers.get_hash_for_string(filepath)
+    if await cache_index.async_run(cache_index.contains, filepath_hash):
+        await async_touch_cached_audio(hass, filepath_hash)
+        return
+    duration = await audio_executor.async_run(helpers.get_audio_duration, filepath, True)
+    await async_store_audio_data(hass, filepath_hash,
+                                 {AUDIO_PATH_KEY: filepath, AUDIO_DURATION_KEY: duration},
+                                 CACHE_KIND_CHIME)
+
+
+async def async_evict_cached_audio(hass: HomeAssistant):
+    """Remove the least recently (or frequently) used cached audio until the disk cache budgets are met."""
+    if not disk_cache.has_budgets:
+        return
+    await cache_index.async_flush_accesses()
+
+    # Add file sizes to cached audio data stored without them
+    unsized_paths = {
+        filepath_hash: get_audio_dict_paths(audio_dict)
+        for filepath_hash, audio_dict in (await cache_index.async_run(cache_index.get_unsized)).items()
+    }
+    if len(unsized_paths) > 0:
+        file_sizes = await audio_executor.async_run(
+            helpers.get_file_sizes,
+            [audio_path for audio_paths in unsized_paths.values() for audio_path in audio_paths])
+        await cache_index.async_run(cache_index.set_sizes, {
+            filepath_hash: sum(file_sizes.get(audio_path, 0) for audio_path in audio_paths)
+            for filepath_hash, audio_paths in unsized_paths.items()
+        })
+
+    evicted = await cache_index.async_run(disk_cache.select_evictions, cache_index)
+    if len(evicted) == 0:
+        return
+    evicted_paths = [audio_path
+                     for audio_dict in evicted.values()
+                     for audio_path in get_audio_dict_paths(audio_dict)]
+    for filepath_hash in evicted:
+        memory_cache.remove(filepath_hash)
+    await async_update_stored_data(hass, removals=list(evicted))
+    await async_delete_cached_files(evicted_paths)
+
+
+async def async_delete_cached_files(audio_paths: list):
+    """Delete audio files not used by any cached audio data, as identical audio is stored once. Return the number of files deleted, bytes freed and files which could not be deleted."""
+    if len(audio_paths) == 0:
+        return 0, 0, 0
+    referenced_paths = await cache_index.async_run(cache_index.get_referenced_paths, audio_paths)
+    audio_paths = [audio_path for audio_path in dict.fromkeys(audio_paths) if audio_path not in referenced_paths]
+    return await audio_executor.async_run(helpers.delete_files, audio_paths)
+
+
+async def async_maintain_cached_audio(hass: HomeAssistant):
+    """Update cached audio data stored in older formats, then enforce the disk cache budgets."""
+    await async_migrate_cached_audio_durations(hass)
+    await async_evict_cached_audio(hass)
+
+
+async def async_migrate_cached_audio_durations(hass: HomeAssistant):
+    """Add durations, read from the audio file headers, to cached audio data stored in the old format."""
+    durations = {}
+    for filepath_hash, audio_dict in (await cache_index.async_run(cache_index.get_without_duration)).items():
+        duration = await audio_executor.async_run(helpers.get_audio_duration, str(audio_dict[AUDIO_PATH_KEY]))
+        if duration is not None:
+            durations[filepath_hash] = duration
+
+    if len(durations) > 0:
+        await cache_index.async_run(cache_index.set_durations, durations)
+        _LOGGER.debug("Added durations to %s cached audio files", str(len(durations)))
 
 
 async def async_get_cached_audio_data(hass: HomeAssistant, filepath_hash: str):
@@ -1056,14 +1603,12 @@ async def async_get_cached_audio_data(hass: HomeAssistant, filepath_hash: str):
         cached_path = audio_dict[AUDIO_PATH_KEY]
 
         # Validate Path
-        if cached_path is not None and os.path.exists(str(cached_path)):
+        if cached_path is not None and await audio_executor.async_run(os.path.exists, str(cached_path)):
             if audio_dict[AUDIO_DURATION_KEY] is None:
                 # Add duration data if audio_dict is old format
-                audio = await async_get_audio_from_path(hass=hass,
-                                                        filepath=cached_path,
-                                                        cache=True)
-                if audio is not None:
-                    audio_dict[AUDIO_DURATION_KEY] = float(len(audio) / 1000.0)
+                duration = await audio_executor.async_run(helpers.get_audio_duration, str(cached_path), True)
+                if duration is not None:
+                    audio_dict[AUDIO_DURATION_KEY] = duration
                     await async_store_data(hass, filepath_hash, audio_dict)
 
         return audio_dict
@@ -1073,6 +1618,66 @@ async def async_get_cached_audio_data(hass: HomeAssistant, filepath_hash: str):
     return None
 
 
+async def async_clear_cached_audio_data(hass: HomeAssistant,
+                                        clear_chimes_cache: bool = False,
+                                        clear_temp_tts_cache: bool = False,
+                                        clear_www_tts_cache: bool = False):
+    """Remove cached audio data and files from Chime TTS' cache in bulk, with a single cache index transaction."""
+    kept_folders = []
+    if clear_chimes_cache is False:
+        kept_folders.append(_data[TEMP_CHIMES_PATH_KEY])
+    if clear_temp_tts_cache is False:
+        kept_folders.append(_data[TEMP_PATH_KEY])
+    if clear_www_tts_cache is False:
+        kept_folders.append(_data[WWW_PATH_KEY])
+
+    # Select the cached audio to remove
+    removed_keys = []
+    removed_paths = []
+    kept_paths = {}
+    for filepath_hash, audio_dict in (await cache_index.async_run(cache_index.get_all)).items():
+        audio_paths = [str(audio_path) for audio_path in get_audio_dict_paths(audio_dict) if audio_path]
+        if len(audio_paths) > 0 and any(folder in audio_paths[0] for folder in kept_folders):
+            kept_paths[audio_paths[0]] = filepath_hash
+            continue
+        removed_keys.append(filepath_hash)
+        removed_paths.extend(audio_paths)
+
+    # Cached audio files which no longer exist are removed, even from kept folders
+    missing_paths = await audio_executor.async_run(helpers.get_missing_files, list(kept_paths))
+    removed_keys.extend(kept_paths[missing_path] for missing_path in missing_paths)
+
+    for filepath_hash in removed_keys:
+        memory_cache.remove(filepath_hash)
+    await async_update_stored_data(hass, removals=removed_keys)
+
+    # Delete the files no longer used by kept cached audio, in parallel batches
+    referenced_paths = await cache_index.async_run(cache_index.get_referenced_paths, removed_paths)
+    removed_paths = [audio_path for audio_path in dict.fromkeys(removed_paths) if audio_path not in referenced_paths]
+    results = await asyncio.gather(
+        *[
+            audio_executor.async_run(helpers.delete_files,
+                                     removed_paths[index:index + CACHE_CLEAR_BATCH_SIZE])
+            for index in range(0, len(removed_paths), CACHE_CLEAR_BATCH_SIZE)
+        ]
+    )
+    deleted_count = sum(result[0] for result in results)
+    bytes_freed = sum(result[1] for result in results)
+    failed_count = sum(result[2] for result in results)
+
+    _LOGGER.debug(" - %s cached entries removed, %s files deleted (%s bytes)",
+                  str(len(removed_keys)), str(deleted_count), str(bytes_freed))
+    if failed_count > 0:
+        _LOGGER.warning(" - Unable to delete %s cached files", str(failed_count))
+
+    return {
+        "entries_removed": len(removed_keys),
+        "files_deleted": deleted_count,
+        "files_failed": failed_count,
+        "bytes_freed": bytes_freed,
+    }
+
+
 async def async_remove_cached_audio_data(hass: HomeAssistant,
                                          filepath_hash: str,
                                          clear_chimes_cache: bool = False,
@@ -1090,7 +1695,7 @@ async def async_remove_cached_audio_data(hass: HomeAssistant,
             audio_dict = {AUDIO_PATH_KEY: audio_dict}
 
         cached_path = audio_dict[AUDIO_PATH_KEY]
-        if cached_path and os.path.exists(cached_path):
+        if cached_path and await audio_executor.async_run(os.path.exists, cached_path):
 
             # Stop if user wishes to keep chime file
             if temp_chimes_path in cached_path and clear_chimes_cache is False:
@@ -1102,20 +1707,17 @@ async def async_remove_cached_audio_data(hass: HomeAssistant,
             if public_path in cached_path and clear_www_tts_cache is False:
                 return
 
-            os.remove(str(cached_path))
-            if os.path.exists(cached_path):
-                _LOGGER.warning(
-                    " - Unable to delete cached file '%s'.", str(cached_path)
-                )
+            memory_cache.remove(filepath_hash)
+            await async_update_stored_data(hass, removals=[filepath_hash])
+            deleted_count, _, failed_count = await async_delete_cached_files(get_audio_dict_paths(audio_dict))
+            if failed_count > 0:
+                _LOGGER.warning(" - Unable to delete %s cached files.", str(failed_count))
             else:
-                _LOGGER.debug(
-                    " - Cached file '%s' deleted successfully.", str(cached_path)
-                )
+                _LOGGER.debug(" - %s cached files deleted successfully.", str(deleted_count))
         else:
             _LOGGER.debug(" - Cached file '%s' not found.", str(cached_path))
-        _data[DATA_STORAGE_KEY].pop(filepath_hash)
-
-        await async_save_data(hass)
+            memory_cache.remove(filepath_hash)
+            await async_update_stored_data(hass, removals=[filepath_hash])
     else:
         _LOGGER.debug(
             " - filepath_hash %s does not exist in the cache.", str(filepath_hash)
@@ -1125,6 +1727,17 @@ async def async_remove_cached_audio_data(hass: HomeAssistant,
 
 
 
+def get_render_key(data, targets):
+    """Key identifying service calls with the same service data for the same media players.
+
+    Every parameter is included, except the priority (a duplicate with a higher
+    priority raises the priority of the queued service call instead).
+    """
+    service_data = {key: value for key, value in dict(data).items() if key != "priority"}
+    service_data_hash = helpers.get_hash_for_string(json.dumps(service_data, sort_keys=True, default=str))
+    return service_data_hash + "-" + ",".join(sorted(targets))
+
+
 def get_filename_hash_from_service_data(params: dict, options: dict):
     """Generate a hash from a unique string."""
 
@@ -1193,6 +1806,48 @@ def update_configuration(config_entry: ConfigEntry, hass: HomeAssistant = None):
     # Queue timeout
     _data[QUEUE_TIMEOUT_KEY] = options.get(QUEUE_TIMEOUT_KEY, QUEUE_TIMEOUT_DEFAULT)
 
+    # Queue concurrency (service calls with different media players processed at the same time)
+    _data[QUEUE_CONCURRENCY_KEY] = options.get(QUEUE_CONCURRENCY_KEY, QUEUE_CONCURRENCY_DEFAULT)
+
+    # Repeat suppression window (seconds)
+    _data[QUEUE_DEDUPE_WINDOW_KEY] = options.get(QUEUE_DEDUPE_WINDOW_KEY, QUEUE_DEDUPE_WINDOW_DEFAULT)
+
+    # Number of queued service calls rendered ahead of playback
+    _data[QUEUE_RENDER_AHEAD_KEY] = options.get(QUEUE_RENDER_AHEAD_KEY, QUEUE_RENDER_AHEAD_DEFAULT)
+
+    # Queue limits
+    _data[QUEUE_MAX_DEPTH_KEY] = options.get(QUEUE_MAX_DEPTH_KEY, QUEUE_MAX_DEPTH_DEFAULT)
+    _data[QUEUE_MAX_AGE_KEY] = options.get(QUEUE_MAX_AGE_KEY, QUEUE_MAX_AGE_DEFAULT)
+    _data[QUEUE_OVERFLOW_POLICY_KEY] = options.get(QUEUE_OVERFLOW_POLICY_KEY, QUEUE_OVERFLOW_POLICY_DEFAULT)
+
+    # Audio rendering worker threads
+    _data[RENDER_WORKERS_KEY] = options.get(RENDER_WORKERS_KEY, RENDER_WORKERS_DEFAULT)
+
+    # Audio rendering engine (threads or worker processes)
+    _data[RENDER_ENGINE_KEY] = options.get(RENDER_ENGINE_KEY, RENDER_ENGINE_DEFAULT)
+
+    # Audio format (all audio is converted to this format when it is loaded)
+    _data[AUDIO_SAMPLE_RATE_KEY] = options.get(AUDIO_SAMPLE_RATE_KEY, AUDIO_SAMPLE_RATE_DEFAULT)
+    _data[AUDIO_CHANNELS_KEY] = options.get(AUDIO_CHANNELS_KEY, AUDIO_CHANNELS_DEFAULT)
+    _data[AUDIO_FORMAT_KEY] = {
+        "frame_rate": int(_data[AUDIO_SAMPLE_RATE_KEY]),
+        "channels": int(_data[AUDIO_CHANNELS_KEY]),
+        "sample_width": AUDIO_SAMPLE_WIDTH,
+    }
+
+    # TTS playback speed engine
+    _data[SPEED_ENGINE_KEY] = options.get(SPEED_ENGINE_KEY, SPEED_ENGINE_DEFAULT)
+
+    # Memory cache size (MB) for decoded TTS audio
+    _data[MEMORY_CACHE_SIZE_KEY] = options.get(MEMORY_CACHE_SIZE_KEY, MEMORY_CACHE_SIZE_DEFAULT)
+
+    # Disk cache budgets (MB) for cached audio files, and the eviction policy
+    _data[DISK_CACHE_SIZE_KEY] = options.get(DISK_CACHE_SIZE_KEY, DISK_CACHE_SIZE_DEFAULT)
+    _data[TEMP_CACHE_SIZE_KEY] = options.get(TEMP_CACHE_SIZE_KEY, TEMP_CACHE_SIZE_DEFAULT)
+    _data[WWW_CACHE_SIZE_KEY] = options.get(WWW_CACHE_SIZE_KEY, WWW_CACHE_SIZE_DEFAULT)
+    _data[CHIMES_CACHE_SIZE_KEY] = options.get(CHIMES_CACHE_SIZE_KEY, CHIMES_CACHE_SIZE_DEFAULT)
+    _data[CACHE_EVICTION_POLICY_KEY] = options.get(CACHE_EVICTION_POLICY_KEY, CACHE_EVICTION_POLICY_DEFAULT)
+
     # Media folder (default local)
     _data[MEDIA_DIR_KEY] = options.get(MEDIA_DIR_KEY, MEDIA_DIR_DEFAULT)
 
@@ -1224,6 +1879,22 @@ def update_configuration(config_entry: ConfigEntry, hass: HomeAssistant = None):
     # Debug summary
     for key_string in [
         QUEUE_TIMEOUT_KEY,
+        QUEUE_CONCURRENCY_KEY,
+        QUEUE_DEDUPE_WINDOW_KEY,
+        QUEUE_RENDER_AHEAD_KEY,
+        QUEUE_MAX_DEPTH_KEY,
+        QUEUE_MAX_AGE_KEY,
+        QUEUE_OVERFLOW_POLICY_KEY,
+        RENDER_WORKERS_KEY,
+        RENDER_ENGINE_KEY,
+        MEMORY_CACHE_SIZE_KEY,
+        DISK_CACHE_SIZE_KEY,
+        TEMP_CACHE_SIZE_KEY,
+        WWW_CACHE_SIZE_KEY,
+        CHIMES_CACHE_SIZE_KEY,
+        CACHE_EVICTION_POLICY_KEY,
+        AUDIO_FORMAT_KEY,
+        SPEED_ENGINE_KEY,
         TEMP_CHIMES_PATH_KEY,
         TEMP_PATH_KEY,
         WWW_PATH_KEY,
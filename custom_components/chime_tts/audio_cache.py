@@ -0,0 +1,74 @@
+"""In-memory cache of decoded audio for Chime TTS."""
+
+import logging
+from collections import OrderedDict
+
+from pydub import AudioSegment
+
+from .const import (
+    MEMORY_CACHE_SIZE_DEFAULT,
+    METRIC_MEMORY_CACHE_HITS,
+    METRIC_MEMORY_CACHE_MISSES,
+    METRIC_MEMORY_CACHE_BYTES,
+)
+from .metrics import ChimeTTSMetrics
+
+_LOGGER = logging.getLogger(__name__)
+
+class ChimeTTSAudioCache:
+    """Least recently used cache of decoded AudioSegments, bounded by the total size of their PCM data."""
+
+    def __init__(self, metrics: ChimeTTSMetrics, max_size_mb: float = MEMORY_CACHE_SIZE_DEFAULT):
+        """Initialize the audio cache."""
+        self.metrics = metrics
+        self.entries = OrderedDict()
+        self.size_bytes = 0
+        self.max_bytes = 0
+        self.set_max_size(max_size_mb)
+        self.metrics.register_gauge(METRIC_MEMORY_CACHE_BYTES, lambda: self.size_bytes)
+
+    def set_max_size(self, max_size_mb: float):
+        """Set the cache's memory budget in megabytes (0 disables the cache)."""
+        self.max_bytes = int(max(0, float(max_size_mb)) * 1024 * 1024)
+        self.evict()
+
+    def get(self, key: str):
+        """Return the cached audio for a key (marking it as recently used), or None."""
+        audio = self.entries.get(key)
+        if audio is None:
+            if self.max_bytes > 0:
+                self.metrics.increment(METRIC_MEMORY_CACHE_MISSES)
+            return None
+        self.entries.move_to_end(key)
+        self.metrics.increment(METRIC_MEMORY_CACHE_HITS)
+        return audio
+
+    def put(self, key: str, audio: AudioSegment):
+        """Add audio to the cache, evicting the least recently used audio if over budget."""
+        if audio is None:
+            return
+        size = len(audio.raw_data)
+        if size > self.max_bytes:
+            return
+        self.remove(key)
+        self.entries[key] = audio
+        self.size_bytes += size
+        self.evict()
+
+    def remove(self, key: str):
+        """Remove the audio for a key from the cache."""
+        audio = self.entries.pop(key, None)
+        if audio is not None:
+            self.size_bytes -= len(audio.raw_data)
+
+    def clear(self):
+        """Remove all audio from the cache."""
+        self.entries.clear()
+        self.size_bytes = 0
+
+    def evict(self):
+        """Remove the least recently used audio until the cache is within its budget."""
+        while self.size_bytes > self.max_bytes and len(self.entries) > 0:
+            key, audio = self.entries.popitem(last=False)
+            self.size_bytes -= len(audio.raw_data)
+            _LOGGER.debug("Evicted audio '%s' from the memory cache", key)
@@ -0,0 +1,224 @@
+"""Dedicated executor for Chime TTS audio rendering and file I/O."""
+
+import asyncio
+import contextlib
+import functools
+import importlib
+import logging
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from multiprocessing import resource_tracker, shared_memory
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+from pydub import AudioSegment
+
+from .const import (
+    RENDER_WORKERS_DEFAULT,
+    RENDER_ENGINE_PROCESS,
+    RENDER_ENGINE_DEFAULT,
+    LOOP_LAG_INTERVAL_S,
+    METRIC_LOOP_LAG,
+    METRIC_EXECUTOR_JOBS,
+)
+from .metrics import ChimeTTSMetrics
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def attach_shared_memory(name: str):
+    """Attach to a shared memory block created by another process, without taking ownership of it.
+
+    Attaching registers the block with the resource tracker. Spawned render
+    workers share the main process' tracker, where the block's creator has
+    already registered it, so this is a no-op there. A process running its
+    own tracker unregisters the block again, otherwise its tracker would
+    unlink the block (and warn of a leak) when the process exits.
+    """
+    shm = shared_memory.SharedMemory(name=name)
+    if multiprocessing.parent_process() is not None and resource_tracker._resource_tracker._pid is not None:
+        resource_tracker.unregister(shm._name, "shared_memory")
+    return shm
+
+
+class SharedAudioSegment:
+    """Reference to an AudioSegment's PCM data held in shared memory, passed between processes instead of the audio itself.
+
+    Only the process holding the block's handle (its creator, or the main
+    process once a worker hands its result over) unlinks it.
+    """
+
+    def __init__(self, audio: AudioSegment):
+        """Copy the audio's PCM data into a new shared memory block."""
+        raw_data = audio.raw_data
+        self.size = len(raw_data)
+        self.sample_width = audio.sample_width
+        self.frame_rate = audio.frame_rate
+        self.channels = audio.channels
+        self.shm = shared_memory.SharedMemory(create=True, size=max(1, self.size))
+        self.shm.buf[:self.size] = raw_data
+        self.name = self.shm.name
+
+    def __getstate__(self):
+        """Pickle the reference to the block, without the creator's handle."""
+        state = self.__dict__.copy()
+        state["shm"] = None
+        return state
+
+    def to_audio_segment(self):
+        """Rebuild the AudioSegment from shared memory."""
+        shm = self.shm if self.shm is not None else attach_shared_memory(self.name)
+        try:
+            raw_data = bytes(shm.buf[:self.size])
+        finally:
+            if shm is not self.shm:
+                shm.close()
+        return AudioSegment(data=raw_data,
+                            sample_width=self.sample_width,
+                            frame_rate=self.frame_rate,
+                            channels=self.channels)
+
+    def hand_over(self):
+        """Close the creator's handle, leaving the block (and its release) to the process receiving it."""
+        if self.shm is not None:
+            self.shm.close()
+            self.shm = None
+
+    def take_over(self):
+        """Take ownership of a block handed over by another process."""
+        if self.shm is None:
+            self.shm = shared_memory.SharedMemory(name=self.name)
+
+    def unlink(self):
+        """Release the shared memory block."""
+        if self.shm is not None:
+            self.shm.close()
+            with contextlib.suppress(FileNotFoundError):
+                self.shm.unlink()
+            self.shm = None
+
+
+def run_in_worker_process(function, *args):
+    """Run a function in a render worker process, exchanging AudioSegments via shared memory."""
+    args = [arg.to_audio_segment() if isinstance(arg, SharedAudioSegment) else arg
+            for arg in args]
+    result = function(*args)
+    if isinstance(result, AudioSegment):
+        shared_result = SharedAudioSegment(result)
+        shared_result.hand_over()
+        return shared_result
+    return result
+
+
+class ChimeTTSAudioExecutor:
+    """Bounded thread pool running blocking audio work, separate from Home Assistant's shared executor."""
+
+    def __init__(self, metrics: ChimeTTSMetrics):
+        """Initialize the audio executor."""
+        self.metrics = metrics
+        self.max_workers = RENDER_WORKERS_DEFAULT
+        self.engine = RENDER_ENGINE_DEFAULT
+        self.executor = None
+        self.process_executor = None
+        self.jobs = 0
+        self.monitor_task = None
+        self.metrics.register_gauge(METRIC_EXECUTOR_JOBS, lambda: self.jobs)
+
+    def start(self,
+              hass: HomeAssistant,
+              config_entry: ConfigEntry,
+              max_workers: int = RENDER_WORKERS_DEFAULT,
+              engine: str = RENDER_ENGINE_DEFAULT):
+        """Create the worker pools and start monitoring event loop responsiveness."""
+        max_workers = max(1, int(max_workers))
+        if max_workers != self.max_workers or engine != self.engine:
+            self.shutdown_executors()
+        self.max_workers = max_workers
+        self.engine = engine
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                               thread_name_prefix="chime_tts_audio")
+            _LOGGER.debug("Audio executor started with %s workers", str(self.max_workers))
+        if self.engine == RENDER_ENGINE_PROCESS and self.process_executor is None:
+            # Spawned workers import Home Assistant's bootstrap module before this
+            # integration, matching the import order of the main process.
+            self.process_executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=importlib.import_module,
+                initargs=("homeassistant.bootstrap",),
+            )
+            _LOGGER.debug("Render worker processes started with %s workers", str(self.max_workers))
+        if self.monitor_task is None or self.monitor_task.done():
+            self.monitor_task = config_entry.async_create_background_task(
+                hass, self.async_monitor_loop_lag(), "chime_tts_loop_lag_monitor"
+            )
+
+    async def async_stop(self):
+        """Stop monitoring and shut down the thread pool once queued jobs complete."""
+        if self.monitor_task is not None:
+            self.monitor_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self.monitor_task
+            self.monitor_task = None
+        self.shutdown_executors()
+
+    def shutdown_executors(self):
+        """Shut down the worker pools once running jobs complete."""
+        if self.executor is not None:
+            self.executor.shutdown(wait=False)
+            self.executor = None
+            _LOGGER.debug("Audio executor stopped")
+        if self.process_executor is not None:
+            self.process_executor.shutdown(wait=False, cancel_futures=True)
+            self.process_executor = None
+            _LOGGER.debug("Render worker processes stopped")
+
+    async def async_run(self, function, *args, **kwargs):
+        """Run a blocking function in the audio executor and return its result."""
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                               thread_name_prefix="chime_tts_audio")
+        self.jobs += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(
+                self.executor, functools.partial(function, *args, **kwargs)
+            )
+        finally:
+            self.jobs -= 1
+
+    async def async_run_cpu(self, function, *args):
+        """Run CPU-bound audio work, in a render worker process when the process engine is selected."""
+        if self.engine != RENDER_ENGINE_PROCESS:
+            return await self.async_run(function, *args)
+        return await self.async_run(self.run_in_process, function, *args)
+
+    def run_in_process(self, function, *args):
+        """Send audio to a render worker process via shared memory and wait for the result (runs in the thread pool)."""
+        process_executor = self.process_executor
+        if process_executor is None:
+            return function(*args)
+        shared_args = [SharedAudioSegment(arg) if isinstance(arg, AudioSegment) else arg
+                       for arg in args]
+        try:
+            result = process_executor.submit(run_in_worker_process, function, *shared_args).result()
+        finally:
+            for arg in shared_args:
+                if isinstance(arg, SharedAudioSegment):
+                    arg.unlink()
+        if isinstance(result, SharedAudioSegment):
+            result.take_over()
+            try:
+                return result.to_audio_segment()
+            finally:
+                result.unlink()
+        return result
+
+    async def async_monitor_loop_lag(self):
+        """Record how late the event loop wakes up from a sleep, i.e. how long it was blocked."""
+        while True:
+            start_time = time.monotonic()
+            await asyncio.sleep(LOOP_LAG_INTERVAL_S)
+            lag_ms = max(0.0, (time.monotonic() - start_time - LOOP_LAG_INTERVAL_S) * 1000)
+            self.metrics.record(METRIC_LOOP_LAG, lag_ms)
@@ -0,0 +1,369 @@
+"""SQLite index of the audio in Chime TTS' cache."""
+
+import asyncio
+import functools
+import json
+import logging
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from .const import (
+    AUDIO_PATH_KEY,
+    AUDIO_DURATION_KEY,
+    AUDIO_FORMAT_KEY,
+    AUDIO_SIZE_KEY,
+    AUDIO_LAST_ACCESS_KEY,
+    AUDIO_ACCESS_COUNT_KEY,
+    AUDIO_RENDITIONS_KEY,
+    AUDIO_PASSTHROUGH_KEY,
+    AUDIO_SOURCE_PATH_KEY,
+    CACHE_EVICTION_POLICY_LFU,
+    CACHE_PATH_QUERY_SIZE,
+    CACHE_ACCESS_FLUSH_DELAY_S,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+CREATE_STATEMENTS = [
+    """CREATE TABLE IF NOT EXISTS audio_cache (
+        hash TEXT PRIMARY KEY,
+        kind TEXT,
+        path TEXT,
+        duration REAL,
+        format TEXT,
+        size INTEGER,
+        created REAL,
+        last_access REAL,
+        hits INTEGER NOT NULL DEFAULT 0,
+        extra TEXT
+    )""",
+    "CREATE INDEX IF NOT EXISTS audio_cache_last_access ON audio_cache (last_access)",
+    "CREATE INDEX IF NOT EXISTS audio_cache_hits ON audio_cache (hits, last_access)",
+    # Every audio file of each cached audio_dict, as identical audio is stored once and may be shared
+    """CREATE TABLE IF NOT EXISTS audio_cache_files (
+        hash TEXT NOT NULL,
+        path TEXT NOT NULL,
+        PRIMARY KEY (hash, path)
+    )""",
+    "CREATE INDEX IF NOT EXISTS audio_cache_files_path ON audio_cache_files (path)",
+]
+SELECT_COLUMNS = "hash, path, duration, format, size, last_access, hits, extra"
+UPSERT_STATEMENT = """INSERT INTO audio_cache
+    (hash, kind, path, duration, format, size, created, last_access, hits, extra)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT (hash) DO UPDATE SET
+        kind = COALESCE(excluded.kind, kind),
+        path = excluded.path,
+        duration = excluded.duration,
+        format = excluded.format,
+        size = excluded.size,
+        last_access = excluded.last_access,
+        hits = excluded.hits,
+        extra = excluded.extra"""
+FOLDER_CONDITION = "substr(path, 1, length(?)) = ?"
+
+
+def get_folder_condition(folder: str, excluded_folders: list = None):
+    """Build the SQL condition (and its parameters) matching paths in a folder, but not in its excluded sub folders."""
+    condition = FOLDER_CONDITION
+    parameters = (folder, folder)
+    for excluded_folder in excluded_folders or []:
+        condition += f" AND NOT {FOLDER_CONDITION}"
+        parameters += (excluded_folder, excluded_folder)
+    return condition, parameters
+
+
+def get_audio_paths(audio_dict):
+    """Paths of all audio files for a cached audio_dict (or an old format audio path)."""
+    if not isinstance(audio_dict, dict):
+        return [audio_dict] if isinstance(audio_dict, str) else []
+    if audio_dict.get(AUDIO_PASSTHROUGH_KEY, False) is True:
+        return []
+    audio_paths = [audio_dict.get(AUDIO_PATH_KEY)]
+    audio_paths.extend((audio_dict.get(AUDIO_RENDITIONS_KEY) or {}).values())
+    audio_paths.append(audio_dict.get(AUDIO_SOURCE_PATH_KEY))
+    return [str(audio_path) for audio_path in dict.fromkeys(audio_paths) if audio_path]
+
+
+class ChimeTTSCacheIndex:
+    """Catalog of cached audio with one row per audio_dict, so lookups and updates are single row operations.
+
+    The SQLite connection is only used from the index's own worker thread, which serializes
+    its queries without locks and keeps them off the event loop. Accesses of cached audio are
+    collected on the event loop and written together, shortly after, or with the next update.
+    """
+
+    def __init__(self):
+        """Initialize the cache index (not yet opened)."""
+        self.path = None
+        self.connection = None
+        self.executor = None
+        self.pending_accesses = {}
+        self.flush_handle = None
+        self.flush_task = None
+
+    async def async_run(self, function, *args):
+        """Run a function using the cache index in its worker thread and return its result."""
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="chime_tts_cache_index")
+        return await asyncio.get_running_loop().run_in_executor(
+            self.executor, functools.partial(function, *args)
+        )
+
+    async def async_update(self, updates: dict = None, removals: list = None, kind: str = None):
+        """Add/replace and remove many audio_dicts, with the pending accesses, in a single transaction."""
+        await self.async_run(self.update, updates, removals, kind, self.take_pending_accesses())
+
+    def record_access(self, filepath_hash: str):
+        """Record an access of cached audio, written to the database by the next flush (call from the event loop)."""
+        _, hits = self.pending_accesses.get(filepath_hash, (None, 0))
+        self.pending_accesses[filepath_hash] = (time.time(), hits + 1)
+        if self.flush_handle is None:
+            self.flush_handle = asyncio.get_running_loop().call_later(
+                CACHE_ACCESS_FLUSH_DELAY_S, self.start_flush)
+
+    def take_pending_accesses(self):
+        """Return the pending accesses, by key, leaving none pending."""
+        if self.flush_handle is not None:
+            self.flush_handle.cancel()
+            self.flush_handle = None
+        accesses, self.pending_accesses = self.pending_accesses, {}
+        return accesses
+
+    def start_flush(self):
+        """Write the pending accesses in the background (the flush timer's callback)."""
+        self.flush_handle = None
+        self.flush_task = asyncio.get_running_loop().create_task(self.async_flush_accesses())
+
+    async def async_flush_accesses(self):
+        """Write the pending accesses to the database."""
+        accesses = self.take_pending_accesses()
+        if len(accesses) > 0:
+            await self.async_run(self.write_accesses, accesses)
+
+    async def async_close(self):
+        """Write the pending accesses, then close the database and stop the worker thread."""
+        if self.executor is None:
+            self.take_pending_accesses()
+            return
+        await self.async_flush_accesses()
+        await self.async_run(self.close)
+        self.executor.shutdown(wait=False)
+        self.executor = None
+
+    def open(self, path: str):
+        """Open (or create) the database at the path, in WAL mode."""
+        if self.connection is not None and path == self.path:
+            return
+        self.close()
+        self.path = path
+        self.get_connection()
+        _LOGGER.debug("Cache index opened: %s", path)
+
+    def close(self):
+        """Close the database connection. It is reopened by the next query."""
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
+
+    def get_connection(self):
+        """Return the database connection, opening it on first use."""
+        if self.connection is None:
+            self.connection = sqlite3.connect(self.path, check_same_thread=False)
+            self.connection.execute("PRAGMA journal_mode=WAL")
+            self.connection.execute("PRAGMA synchronous=NORMAL")
+            with self.connection:
+                for statement in CREATE_STATEMENTS:
+                    self.connection.execute(statement)
+                # Index the files of cached audio stored before the files table existed
+                if self.connection.execute("SELECT 1 FROM audio_cache_files LIMIT 1").fetchone() is None:
+                    self.insert_files(self.connection, self.select())
+        return self.connection
+
+    #######################
+    ### Row conversions ###
+    #######################
+
+    def get_row(self, filepath_hash: str, audio_dict, kind: str = None):
+        """Database row values for an audio_dict (or an old format audio path)."""
+        audio_dict = dict(audio_dict) if isinstance(audio_dict, dict) else {AUDIO_PATH_KEY: audio_dict}
+        audio_path = audio_dict.pop(AUDIO_PATH_KEY, None)
+        duration = audio_dict.pop(AUDIO_DURATION_KEY, None)
+        audio_format = audio_dict.pop(AUDIO_FORMAT_KEY, None)
+        size = audio_dict.pop(AUDIO_SIZE_KEY, None)
+        last_access = audio_dict.pop(AUDIO_LAST_ACCESS_KEY, None)
+        hits = int(audio_dict.pop(AUDIO_ACCESS_COUNT_KEY, 0))
+        return (
+            filepath_hash,
+            kind,
+            str(audio_path) if audio_path is not None else None,
+            duration,
+            json.dumps(audio_format) if audio_format is not None else None,
+            size,
+            time.time(),
+            last_access,
+            hits,
+            json.dumps(audio_dict) if len(audio_dict) > 0 else None,
+        )
+
+    def get_audio_dict(self, row):
+        """Return the audio_dict for a database row selected with SELECT_COLUMNS."""
+        _, audio_path, duration, audio_format, size, last_access, hits, extra = row
+        audio_dict = json.loads(extra) if extra else {}
+        audio_dict[AUDIO_PATH_KEY] = audio_path
+        audio_dict[AUDIO_DURATION_KEY] = duration
+        if audio_format is not None:
+            audio_dict[AUDIO_FORMAT_KEY] = json.loads(audio_format)
+        if size is not None:
+            audio_dict[AUDIO_SIZE_KEY] = size
+        if last_access is not None:
+            audio_dict[AUDIO_LAST_ACCESS_KEY] = last_access
+        audio_dict[AUDIO_ACCESS_COUNT_KEY] = hits
+        return audio_dict
+
+    def select(self, condition: str = None, parameters: tuple = ()):
+        """Return the cached audio_dicts matching a condition, by key."""
+        statement = f"SELECT {SELECT_COLUMNS} FROM audio_cache"
+        if condition:
+            statement += f" WHERE {condition}"
+        return {row[0]: self.get_audio_dict(row)
+                for row in self.get_connection().execute(statement, parameters)}
+
+    ###############
+    ### Queries ###
+    ###############
+
+    def get(self, filepath_hash: str):
+        """Return the cached audio_dict for a key, or None."""
+        return self.select("hash = ?", (filepath_hash,)).get(filepath_hash)
+
+    def contains(self, filepath_hash: str):
+        """Whether cached audio exists for a key."""
+        return self.get_connection().execute(
+            "SELECT 1 FROM audio_cache WHERE hash = ?", (filepath_hash,)).fetchone() is not None
+
+    def get_all(self):
+        """All cached audio_dicts by key."""
+        return self.select()
+
+    def get_unsized(self):
+        """Return the cached audio_dicts stored without the size of their files, by key."""
+        return self.select("size IS NULL AND path IS NOT NULL")
+
+    def get_without_duration(self):
+        """Return the cached audio_dicts stored without a duration, by key."""
+        return self.select("duration IS NULL AND path IS NOT NULL")
+
+    def get_referenced_paths(self, audio_paths: list):
+        """Return the audio file paths used by any cached audio_dict."""
+        audio_paths = list(dict.fromkeys(audio_paths))
+        referenced_paths = set()
+        for index in range(0, len(audio_paths), CACHE_PATH_QUERY_SIZE):
+            batch = audio_paths[index:index + CACHE_PATH_QUERY_SIZE]
+            placeholders = ", ".join("?" * len(batch))
+            referenced_paths.update(
+                row[0] for row in self.get_connection().execute(
+                    f"SELECT DISTINCT path FROM audio_cache_files WHERE path IN ({placeholders})", batch))
+        return referenced_paths
+
+    def get_total_size(self, folder: str = None, excluded_folders: list = None):
+        """Total size (bytes) of the cached audio files, optionally only those in a folder (outside its excluded sub folders)."""
+        if folder is None:
+            row = self.get_connection().execute("SELECT SUM(size) FROM audio_cache").fetchone()
+        else:
+            condition, parameters = get_folder_condition(folder, excluded_folders)
+            row = self.get_connection().execute(
+                f"SELECT SUM(size) FROM audio_cache WHERE {condition}", parameters).fetchone()
+        return int(row[0] or 0)
+
+    def get_eviction_candidates(self, policy: str, folder: str = None, excluded_folders: list = None):
+        """Yield (key, size, audio_dict) for cached audio, least recently (or frequently) used first."""
+        statement = f"SELECT {SELECT_COLUMNS} FROM audio_cache WHERE path IS NOT NULL"
+        parameters = ()
+        if folder is not None:
+            condition, parameters = get_folder_condition(folder, excluded_folders)
+            statement += f" AND {condition}"
+        if policy == CACHE_EVICTION_POLICY_LFU:
+            statement += " ORDER BY hits, last_access"
+        else:
+            statement += " ORDER BY last_access"
+        for row in self.get_connection().execute(statement, parameters):
+            yield row[0], int(row[4] or 0), self.get_audio_dict(row)
+
+    def count(self):
+        """Return the number of cached audio entries."""
+        return self.get_connection().execute("SELECT COUNT(*) FROM audio_cache").fetchone()[0]
+
+    ###############
+    ### Updates ###
+    ###############
+
+    def insert_files(self, connection, audio_dicts: dict):
+        """Add the audio file paths of audio_dicts, by key, to the files table."""
+        connection.executemany(
+            "INSERT OR IGNORE INTO audio_cache_files (hash, path) VALUES (?, ?)",
+            [(filepath_hash, audio_path)
+             for filepath_hash, audio_dict in audio_dicts.items()
+             for audio_path in get_audio_paths(audio_dict)])
+
+    def update(self, updates: dict = None, removals: list = None, kind: str = None, accesses: dict = None):
+        """Add/replace and remove many audio_dicts, and record accesses, in a single transaction."""
+        connection = self.get_connection()
+        with connection:
+            if accesses:
+                self.insert_accesses(connection, accesses)
+            removed_hashes = [(filepath_hash,) for filepath_hash in [*(updates or {}), *(removals or [])]]
+            connection.executemany("DELETE FROM audio_cache_files WHERE hash = ?", removed_hashes)
+            if updates:
+                connection.executemany(
+                    UPSERT_STATEMENT,
+                    [self.get_row(filepath_hash, audio_dict, kind)
+                     for filepath_hash, audio_dict in updates.items()])
+                self.insert_files(connection, updates)
+            if removals:
+                connection.executemany(
+                    "DELETE FROM audio_cache WHERE hash = ?",
+                    [(filepath_hash,) for filepath_hash in removals])
+
+    def insert_accesses(self, connection, accesses: dict):
+        """Set the last access time and add to the access count of many cached audio entries, by key."""
+        connection.executemany(
+            "UPDATE audio_cache SET last_access = ?, hits = hits + ? WHERE hash = ?",
+            [(last_access, hits, filepath_hash) for filepath_hash, (last_access, hits) in accesses.items()])
+
+    def write_accesses(self, accesses: dict):
+        """Record many accesses of cached audio, by key, in a single transaction."""
+        with self.get_connection() as connection:
+            self.insert_accesses(connection, accesses)
+
+    def set_sizes(self, sizes: dict):
+        """Set the size (bytes) of the files of many cached audio entries, by key."""
+        with self.get_connection() as connection:
+            connection.executemany(
+                "UPDATE audio_cache SET size = ? WHERE hash = ?",
+                [(size, filepath_hash) for filepath_hash, size in sizes.items()])
+
+    def set_durations(self, durations: dict):
+        """Set the duration of many cached audio entries stored without one, by key."""
+        with self.get_connection() as connection:
+            connection.executemany(
+                "UPDATE audio_cache SET duration = ? WHERE hash = ? AND duration IS NULL",
+                [(duration, filepath_hash) for filepath_hash, duration in durations.items()])
+
+    def import_entries(self, stored_data: dict):
+        """Add the entries of the previous JSON stored data which are not yet indexed, returning their number."""
+        stored_data = {filepath_hash: audio_dict
+                       for filepath_hash, audio_dict in stored_data.items()
+                       if isinstance(audio_dict, dict | str)}
+        connection = self.get_connection()
+        with connection:
+            cursor = connection.executemany(
+                "INSERT OR IGNORE INTO audio_cache"
+                " (hash, kind, path, duration, format, size, created, last_access, hits, extra)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [self.get_row(filepath_hash, audio_dict)
+                 for filepath_hash, audio_dict in stored_data.items()])
+            imported_count = max(0, cursor.rowcount)
+            self.insert_files(connection, stored_data)
+        return imported_count
@@ -0,0 +1,106 @@
+"""Registry of pre-decoded chime audio for Chime TTS."""
+
+import asyncio
+import contextlib
+import logging
+import os
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+from pydub import AudioSegment
+
+from .const import (
+    MP3_PRESETS,
+    MP3_PRESET_PATH,
+    MP3_PRESET_PATH_PLACEHOLDER,
+    CHIME_REGISTRY_WATCH_INTERVAL_S,
+)
+from .audio_executor import ChimeTTSAudioExecutor
+from .helpers import ChimeTTSHelper
+from .mixer import normalize_audio
+
+_LOGGER = logging.getLogger(__name__)
+
+class ChimeTTSChimeRegistry:
+    """Preset and custom chimes decoded into memory, refreshed when their files change."""
+
+    def __init__(self, helpers: ChimeTTSHelper, audio_executor: ChimeTTSAudioExecutor):
+        """Initialize the chime registry."""
+        self.helpers = helpers
+        self.audio_executor = audio_executor
+        self.sources = {}
+        self.audio_format = None
+        self.chimes = {}
+        self.watch_task = None
+
+    def start(self,
+              hass: HomeAssistant,
+              config_entry: ConfigEntry,
+              custom_chime_paths: dict,
+              audio_format: dict):
+        """Decode the preset and custom chimes in the background, then watch their files for changes."""
+        self.audio_format = audio_format
+        self.sources = {preset: MP3_PRESET_PATH + preset + ".mp3" for preset in MP3_PRESETS}
+        for key, path in custom_chime_paths.items():
+            # Downloaded chimes are cached by helpers.async_get_chime_path
+            if path and not path.startswith(("http://", "https://")):
+                self.sources[key] = path
+        self.chimes = {}
+        if self.watch_task is None or self.watch_task.done():
+            self.watch_task = config_entry.async_create_background_task(
+                hass, self.async_watch(hass), "chime_tts_chime_registry"
+            )
+
+    async def async_stop(self):
+        """Stop watching the chime files and release the decoded audio."""
+        if self.watch_task is not None:
+            self.watch_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self.watch_task
+            self.watch_task = None
+        self.chimes = {}
+
+    def get_audio(self, chime_path: str):
+        """Return the decoded audio for a preset or custom chime name, or None if it is not registered."""
+        chime_path = str(chime_path).replace(MP3_PRESET_PATH_PLACEHOLDER, "")
+        chime = self.chimes.get(chime_path)
+        if chime is None:
+            return None
+        return chime["audio"]
+
+    async def async_watch(self, hass: HomeAssistant):
+        """Refresh the registry, then check the chime files for changes periodically."""
+        while True:
+            await self.async_refresh(hass)
+            await asyncio.sleep(CHIME_REGISTRY_WATCH_INTERVAL_S)
+
+    async def async_refresh(self, hass: HomeAssistant):
+        """Decode any chimes which are new or whose files have changed."""
+        for key, path in dict(self.sources).items():
+            try:
+                chime = await self.audio_executor.async_run(self.load_chime,
+                                                            hass,
+                                                            path,
+                                                            self.chimes.get(key))
+            except Exception as error:
+                _LOGGER.debug("Unable to decode chime '%s': %s", key, error)
+                chime = None
+            if chime is None:
+                self.chimes.pop(key, None)
+            elif chime is not self.chimes.get(key):
+                self.chimes[key] = chime
+                _LOGGER.debug("Chime '%s' decoded from: %s", key, chime["path"])
+
+    def load_chime(self, hass: HomeAssistant, path: str, chime: dict = None):
+        """Decode a chime file in the configured audio format, or return the existing chime if its file is unchanged."""
+        local_path = self.helpers.validate_path(hass, path)
+        if local_path is None:
+            return None
+        mtime = os.path.getmtime(local_path)
+        if chime is not None and chime["path"] == local_path and chime["mtime"] == mtime:
+            return chime
+        return {
+            "path": local_path,
+            "mtime": mtime,
+            "audio": normalize_audio(AudioSegment.from_file(local_path), self.audio_format),
+        }
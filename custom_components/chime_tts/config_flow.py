@@ -8,6 +8,50 @@ from .const import (
     DOMAIN,
     QUEUE_TIMEOUT_KEY,
     QUEUE_TIMEOUT_DEFAULT,
+    QUEUE_CONCURRENCY_KEY,
+    QUEUE_CONCURRENCY_DEFAULT,
+    QUEUE_DEDUPE_WINDOW_KEY,
+    QUEUE_DEDUPE_WINDOW_DEFAULT,
+    QUEUE_RENDER_AHEAD_KEY,
+    QUEUE_RENDER_AHEAD_DEFAULT,
+    QUEUE_MAX_DEPTH_KEY,
+    QUEUE_MAX_DEPTH_DEFAULT,
+    QUEUE_MAX_AGE_KEY,
+    QUEUE_MAX_AGE_DEFAULT,
+    RENDER_WORKERS_KEY,
+    RENDER_WORKERS_DEFAULT,
+    RENDER_ENGINE_KEY,
+    RENDER_ENGINE_THREAD,
+    RENDER_ENGINE_PROCESS,
+    RENDER_ENGINE_DEFAULT,
+    MEMORY_CACHE_SIZE_KEY,
+    MEMORY_CACHE_SIZE_DEFAULT,
+    DISK_CACHE_SIZE_KEY,
+    DISK_CACHE_SIZE_DEFAULT,
+    TEMP_CACHE_SIZE_KEY,
+    TEMP_CACHE_SIZE_DEFAULT,
+    WWW_CACHE_SIZE_KEY,
+    WWW_CACHE_SIZE_DEFAULT,
+    CHIMES_CACHE_SIZE_KEY,
+    CHIMES_CACHE_SIZE_DEFAULT,
+    CACHE_EVICTION_POLICY_KEY,
+    CACHE_EVICTION_POLICY_LRU,
+    CACHE_EVICTION_POLICY_LFU,
+    CACHE_EVICTION_POLICY_DEFAULT,
+    AUDIO_SAMPLE_RATE_KEY,
+    AUDIO_SAMPLE_RATE_DEFAULT,
+    AUDIO_SAMPLE_RATES,
+    AUDIO_CHANNELS_KEY,
+    AUDIO_CHANNELS_DEFAULT,
+    SPEED_ENGINE_KEY,
+    SPEED_ENGINE_WSOLA,
+    SPEED_ENGINE_PYDUB,
+    SPEED_ENGINE_DEFAULT,
+    QUEUE_OVERFLOW_POLICY_KEY,
+    QUEUE_OVERFLOW_POLICY_DEFAULT,
+    QUEUE_OVERFLOW_REJECT_NEWEST,
+    QUEUE_OVERFLOW_DROP_OLDEST,
+    QUEUE_OVERFLOW_DROP_LOWEST_PRIORITY,
     MEDIA_DIR_KEY,
     MEDIA_DIR_DEFAULT,
     TEMP_CHIMES_PATH_KEY,
@@ -60,6 +104,113 @@ class ChimeTTSOptionsFlowHandler(config_entries.OptionsFlow):
                         QUEUE_TIMEOUT_KEY, QUEUE_TIMEOUT_DEFAULT
                     ),  # type: ignore
                 ): int,
+                vol.Required(
+                    QUEUE_CONCURRENCY_KEY,
+                    default=self.get_data_key_value(
+                        QUEUE_CONCURRENCY_KEY, QUEUE_CONCURRENCY_DEFAULT
+                    ),  # type: ignore
+                ): int,
+                vol.Required(
+                    QUEUE_DEDUPE_WINDOW_KEY,
+                    default=self.get_data_key_value(
+                        QUEUE_DEDUPE_WINDOW_KEY, QUEUE_DEDUPE_WINDOW_DEFAULT
+                    ),  # type: ignore
+                ): int,
+                vol.Required(
+                    QUEUE_RENDER_AHEAD_KEY,
+                    default=self.get_data_key_value(
+                        QUEUE_RENDER_AHEAD_KEY, QUEUE_RENDER_AHEAD_DEFAULT
+                    ),  # type: ignore
+                ): int,
+                vol.Required(
+                    QUEUE_MAX_DEPTH_KEY,
+                    default=self.get_data_key_value(
+                        QUEUE_MAX_DEPTH_KEY, QUEUE_MAX_DEPTH_DEFAULT
+                    ),  # type: ignore
+                ): int,
+                vol.Required(
+                    QUEUE_OVERFLOW_POLICY_KEY,
+                    default=self.get_data_key_value(
+                        QUEUE_OVERFLOW_POLICY_KEY, QUEUE_OVERFLOW_POLICY_DEFAULT
+                    ),  # type: ignore
+                ): vol.In([QUEUE_OVERFLOW_REJECT_NEWEST,
+                           QUEUE_OVERFLOW_DROP_OLDEST,
+                           QUEUE_OVERFLOW_DROP_LOWEST_PRIORITY]),
+                vol.Required(
+                    QUEUE_MAX_AGE_KEY,
+                    default=self.get_data_key_value(
+                        QUEUE_MAX_AGE_KEY, QUEUE_MAX_AGE_DEFAULT
+                    ),  # type: ignore
+                ): int,
+                vol.Required(
+                    RENDER_WORKERS_KEY,
+                    default=self.get_data_key_value(
+                        RENDER_WORKERS_KEY, RENDER_WORKERS_DEFAULT
+                    ),  # type: ignore
+                ): int,
+                vol.Required(
+                    RENDER_ENGINE_KEY,
+                    default=self.get_data_key_value(
+                        RENDER_ENGINE_KEY, RENDER_ENGINE_DEFAULT
+                    ),  # type: ignore
+                ): vol.In([RENDER_ENGINE_THREAD,
+                           RENDER_ENGINE_PROCESS]),
+                vol.Required(
+                    MEMORY_CACHE_SIZE_KEY,
+                    default=self.get_data_key_value(
+                        MEMORY_CACHE_SIZE_KEY, MEMORY_CACHE_SIZE_DEFAULT
+                    ),  # type: ignore
+                ): int,
+                vol.Required(
+                    DISK_CACHE_SIZE_KEY,
+                    default=self.get_data_key_value(
+                        DISK_CACHE_SIZE_KEY, DISK_CACHE_SIZE_DEFAULT
+                    ),  # type: ignore
+                ): int,
+                vol.Required(
+                    TEMP_CACHE_SIZE_KEY,
+                    default=self.get_data_key_value(
+                        TEMP_CACHE_SIZE_KEY, TEMP_CACHE_SIZE_DEFAULT
+                    ),  # type: ignore
+                ): int,
+                vol.Required(
+                    WWW_CACHE_SIZE_KEY,
+                    default=self.get_data_key_value(
+                        WWW_CACHE_SIZE_KEY, WWW_CACHE_SIZE_DEFAULT
+                    ),  # type: ignore
+                ): int,
+                vol.Required(
+                    CHIMES_CACHE_SIZE_KEY,
+                    default=self.get_data_key_value(
+                        CHIMES_CACHE_SIZE_KEY, CHIMES_CACHE_SIZE_DEFAULT
+                    ),  # type: ignore
+                ): int,
+                vol.Required(
+                    CACHE_EVICTION_POLICY_KEY,
+                    default=self.get_data_key_value(
+                        CACHE_EVICTION_POLICY_KEY, CACHE_EVICTION_POLICY_DEFAULT
+                    ),  # type: ignore
+                ): vol.In([CACHE_EVICTION_POLICY_LRU,
+                           CACHE_EVICTION_POLICY_LFU]),
+                vol.Required(
+                    AUDIO_SAMPLE_RATE_KEY,
+                    default=self.get_data_key_value(
+                        AUDIO_SAMPLE_RATE_KEY, AUDIO_SAMPLE_RATE_DEFAULT
+                    ),  # type: ignore
+                ): vol.In(AUDIO_SAMPLE_RATES),
+                vol.Required(
+                    AUDIO_CHANNELS_KEY,
+                    default=self.get_data_key_value(
+                        AUDIO_CHANNELS_KEY, AUDIO_CHANNELS_DEFAULT
+                    ),  # type: ignore
+                ): vol.In([1, 2]),
+                vol.Required(
+                    SPEED_ENGINE_KEY,
+                    default=self.get_data_key_value(
+                        SPEED_ENGINE_KEY, SPEED_ENGINE_DEFAULT
+                    ),  # type: ignore
+                ): vol.In([SPEED_ENGINE_WSOLA,
+                           SPEED_ENGINE_PYDUB]),
                 vol.Required(
                     MEDIA_DIR_KEY,
                     default=self.get_data_key_value(MEDIA_DIR_KEY,
@@ -130,6 +281,48 @@ class ChimeTTSOptionsFlowHandler(config_entries.OptionsFlow):
             _errors["base"] = "timeout"
             _errors[QUEUE_TIMEOUT_KEY] = "timeout_sub"
 
+        # Concurrency
+        if user_input[QUEUE_CONCURRENCY_KEY] < 1:
+            _errors["base"] = "concurrency"
+            _errors[QUEUE_CONCURRENCY_KEY] = "concurrency_sub"
+
+        # Repeat suppression window
+        if user_input[QUEUE_DEDUPE_WINDOW_KEY] < 0:
+            _errors["base"] = "dedupe_window"
+            _errors[QUEUE_DEDUPE_WINDOW_KEY] = "dedupe_window_sub"
+
+        # Render ahead
+        if user_input[QUEUE_RENDER_AHEAD_KEY] < 0:
+            _errors["base"] = "render_ahead"
+            _errors[QUEUE_RENDER_AHEAD_KEY] = "render_ahead_sub"
+
+        # Queue limits
+        if user_input[QUEUE_MAX_DEPTH_KEY] < 0:
+            _errors["base"] = "queue_max_depth"
+            _errors[QUEUE_MAX_DEPTH_KEY] = "queue_max_depth_sub"
+        if user_input[QUEUE_MAX_AGE_KEY] < 0:
+            _errors["base"] = "queue_max_age"
+            _errors[QUEUE_MAX_AGE_KEY] = "queue_max_age_sub"
+
+        # Render workers
+        if user_input[RENDER_WORKERS_KEY] < 1:
+            _errors["base"] = "render_workers"
+            _errors[RENDER_WORKERS_KEY] = "render_workers_sub"
+
+        # Memory cache size
+        if user_input[MEMORY_CACHE_SIZE_KEY] < 0:
+            _errors["base"] = "memory_cache_size"
+            _errors[MEMORY_CACHE_SIZE_KEY] = "memory_cache_size_sub"
+
+        # Disk cache budgets
+        for key in [DISK_CACHE_SIZE_KEY,
+                    TEMP_CACHE_SIZE_KEY,
+                    WWW_CACHE_SIZE_KEY,
+                    CHIMES_CACHE_SIZE_KEY]:
+            if user_input[key] < 0:
+                _errors["base"] = "disk_cache_size"
+                _errors[key] = "disk_cache_size_sub"
+
         # Validate custom chime mp3 paths
         for i in range(5):
             key = MP3_PRESET_CUSTOM_PREFIX + str(i + 1)
@@ -23,8 +23,11 @@ else:
 SERVICE_SAY = "say"
 SERVICE_SAY_URL = "say_url"
 SERVICE_CLEAR_CACHE = "clear_cache"
+SERVICE_QUEUE_PURGE = "queue_purge"
+SERVICE_QUEUE_CANCEL = "queue_cancel"
 DEFAULT_DELAY_MS = 450
 DATA_STORAGE_KEY = "chime_tts_integration_data"
+CACHE_CLEAR_BATCH_SIZE = 100
 AUDIO_PATH_KEY = "audio_path"
 AUDIO_DURATION_KEY = "audio_duration"
 
@@ -77,9 +80,122 @@ QUEUE_CURRENT_ID_KEY = "QUEUE_CURRENT_ID"
 QUEUE_LAST_ID = "QUEUE_LAST_ID"
 QUEUE_TIMEOUT_KEY = "queue_timeout"
 QUEUE_TIMEOUT_DEFAULT = 60
+QUEUE_CONCURRENCY_KEY = "queue_concurrency"
+QUEUE_CONCURRENCY_DEFAULT = 1
+QUEUE_ALL_TARGETS = "*"
+QUEUE_DEDUPE_WINDOW_KEY = "dedupe_window"
+QUEUE_DEDUPE_WINDOW_DEFAULT = 0
+QUEUE_RENDER_AHEAD_KEY = "render_ahead"
+QUEUE_RENDER_AHEAD_DEFAULT = 2
+QUEUE_MAX_DEPTH_KEY = "queue_max_depth"
+QUEUE_MAX_DEPTH_DEFAULT = 50
+QUEUE_MAX_AGE_KEY = "queue_max_age"
+QUEUE_MAX_AGE_DEFAULT = 0
+QUEUE_OVERFLOW_POLICY_KEY = "queue_overflow_policy"
+QUEUE_OVERFLOW_REJECT_NEWEST = "reject_newest"
+QUEUE_OVERFLOW_DROP_OLDEST = "drop_oldest"
+QUEUE_OVERFLOW_DROP_LOWEST_PRIORITY = "drop_lowest_priority"
+QUEUE_OVERFLOW_POLICY_DEFAULT = QUEUE_OVERFLOW_REJECT_NEWEST
+
+# Audio executor
+RENDER_WORKERS_KEY = "render_workers"
+RENDER_WORKERS_DEFAULT = 2
+RENDER_ENGINE_KEY = "render_engine"
+RENDER_ENGINE_THREAD = "thread"
+RENDER_ENGINE_PROCESS = "process"
+RENDER_ENGINE_DEFAULT = RENDER_ENGINE_THREAD
+LOOP_LAG_INTERVAL_S = 1
+SEGMENT_FETCH_CONCURRENCY = 4
+CHIME_REGISTRY_WATCH_INTERVAL_S = 60
+
+# Audio format all audio is converted to when it is loaded
+AUDIO_FORMAT_KEY = "audio_format"
+AUDIO_RENDITIONS_KEY = "renditions"
+AUDIO_PASSTHROUGH_KEY = "passthrough"
+AUDIO_SOURCE_PATH_KEY = "source_path"
+AUDIO_SIZE_KEY = "size"
+AUDIO_LAST_ACCESS_KEY = "last_access"
+AUDIO_ACCESS_COUNT_KEY = "access_count"
+AUDIO_SAMPLE_RATE_KEY = "sample_rate"
+AUDIO_SAMPLE_RATE_DEFAULT = 24000
+AUDIO_SAMPLE_RATES = [16000, 22050, 24000, 44100, 48000]
+AUDIO_CHANNELS_KEY = "audio_channels"
+AUDIO_CHANNELS_DEFAULT = 1
+AUDIO_SAMPLE_WIDTH = 2
+
+# TTS playback speed engine
+SPEED_ENGINE_KEY = "speed_engine"
+SPEED_ENGINE_WSOLA = "wsola"
+SPEED_ENGINE_PYDUB = "pydub"
+SPEED_ENGINE_DEFAULT = SPEED_ENGINE_WSOLA
+
+# Memory cache of decoded audio
+MEMORY_CACHE_SIZE_KEY = "memory_cache_size"
+MEMORY_CACHE_SIZE_DEFAULT = 32
+
+# Disk cache budgets (MB, 0 for no limit) and eviction policy
+DISK_CACHE_SIZE_KEY = "disk_cache_size"
+DISK_CACHE_SIZE_DEFAULT = 0
+TEMP_CACHE_SIZE_KEY = "temp_cache_size"
+TEMP_CACHE_SIZE_DEFAULT = 0
+WWW_CACHE_SIZE_KEY = "www_cache_size"
+WWW_CACHE_SIZE_DEFAULT = 0
+CHIMES_CACHE_SIZE_KEY = "chimes_cache_size"
+CHIMES_CACHE_SIZE_DEFAULT = 0
+CACHE_EVICTION_POLICY_KEY = "cache_eviction_policy"
+CACHE_EVICTION_POLICY_LRU = "lru"
+CACHE_EVICTION_POLICY_LFU = "lfu"
+CACHE_EVICTION_POLICY_DEFAULT = CACHE_EVICTION_POLICY_LRU
+
+# SQLite cache index (in the Home Assistant config folder) and the kinds of cached audio
+CACHE_INDEX_FILENAME = "chime_tts_cache.db"
+CACHE_KIND_SEGMENT = "segment"
+CACHE_KIND_FINAL = "final"
+CACHE_KIND_CHIME = "chime"
+CACHE_PATH_QUERY_SIZE = 500
+CACHE_ACCESS_FLUSH_DELAY_S = 5
+FILE_HASH_CHUNK_SIZE = 1024 * 1024
+
+# Service call priorities
+PRIORITY_LOW = "low"
+PRIORITY_NORMAL = "normal"
+PRIORITY_HIGH = "high"
+PRIORITY_CRITICAL = "critical"
+PRIORITY_DEFAULT = PRIORITY_NORMAL
+PRIORITY_LEVELS = {
+    PRIORITY_LOW: 0,
+    PRIORITY_NORMAL: 1,
+    PRIORITY_HIGH: 2,
+    PRIORITY_CRITICAL: 3,
+}
+
+# Metrics
+METRICS_KEY = "metrics"
+METRICS_WINDOW_SIZE = 100
+METRIC_QUEUE_DEPTH = "queue_depth"
+METRIC_QUEUE_RUNNING = "queue_running"
+METRIC_QUEUE_WAIT = "queue_wait"
+METRIC_RENDER_TIME = "render_time"
+METRIC_PLAYBACK_TIME = "playback_time"
+METRIC_TIMEOUTS = "timeouts"
+METRIC_CACHE_HITS = "cache_hits"
+METRIC_CACHE_MISSES = "cache_misses"
+METRIC_LOOP_LAG = "loop_lag"
+METRIC_EXECUTOR_JOBS = "executor_jobs"
+METRIC_MEMORY_CACHE_HITS = "memory_cache_hits"
+METRIC_MEMORY_CACHE_MISSES = "memory_cache_misses"
+METRIC_MEMORY_CACHE_BYTES = "memory_cache_bytes"
+METRIC_DISK_CACHE_BYTES = "disk_cache_bytes"
+METRIC_DISK_CACHE_EVICTIONS = "disk_cache_evictions"
 
 # FFmpeg Arguments
 ALEXA_FFMPEG_ARGS = "-y -ac 2 -codec:a libmp3lame -b:a 48k -ar 24000 -write_xing 0"
+FFMPEG_MAX_PROCESSES = 4
+FFMPEG_PCM_FORMATS = {
+    1: "s8",
+    2: "s16le",
+    4: "s32le",
+}
 
 # TTS Platforms
 AMAZON_POLLY = "amazon_polly"
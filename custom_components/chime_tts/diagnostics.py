@@ -0,0 +1,17 @@
+"""Diagnostics support for Chime TTS."""
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN, VERSION, METRICS_KEY
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, config_entry: ConfigEntry
+) -> dict:
+    """Return diagnostics for a config entry."""
+    return {
+        "version": VERSION,
+        "options": dict(config_entry.options),
+        "metrics": hass.data[DOMAIN][METRICS_KEY].as_dict(),
+    }
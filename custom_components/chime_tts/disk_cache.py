@@ -0,0 +1,102 @@
+"""Disk budgets for the audio files in Chime TTS' cache."""
+
+import logging
+import time
+
+from .const import (
+    AUDIO_LAST_ACCESS_KEY,
+    AUDIO_ACCESS_COUNT_KEY,
+    CACHE_EVICTION_POLICY_DEFAULT,
+    METRIC_DISK_CACHE_BYTES,
+    METRIC_DISK_CACHE_EVICTIONS,
+)
+from .cache_index import ChimeTTSCacheIndex, get_audio_paths
+from .metrics import ChimeTTSMetrics
+
+_LOGGER = logging.getLogger(__name__)
+
+class ChimeTTSDiskCache:
+    """Byte budgets for cached audio files, overall and per folder, enforced by LRU or LFU eviction."""
+
+    def __init__(self, metrics: ChimeTTSMetrics):
+        """Initialize the disk cache budgets (no limits)."""
+        self.metrics = metrics
+        self.max_bytes = 0
+        self.folder_max_bytes = {}
+        self.folders = []
+        self.policy = CACHE_EVICTION_POLICY_DEFAULT
+        self.size_bytes = 0
+        self.metrics.register_gauge(METRIC_DISK_CACHE_BYTES, lambda: self.size_bytes)
+
+    def set_budgets(self, max_size_mb: float, folder_max_sizes_mb: dict, policy: str):
+        """Set the overall and per folder budgets in megabytes (0 for no limit), and the eviction policy."""
+        self.max_bytes = self.get_bytes(max_size_mb)
+        self.folder_max_bytes = {
+            folder: self.get_bytes(max_size_mb)
+            for folder, max_size_mb in folder_max_sizes_mb.items()
+            if self.get_bytes(max_size_mb) > 0
+        }
+        self.folders = list(folder_max_sizes_mb)
+        self.policy = policy
+
+    def get_bytes(self, size_mb: float):
+        """Megabytes as bytes."""
+        return int(max(0, float(size_mb)) * 1024 * 1024)
+
+    @property
+    def has_budgets(self):
+        """Whether any budget limits the size of the cache."""
+        return self.max_bytes > 0 or len(self.folder_max_bytes) > 0
+
+    def get_paths(self, audio_dict):
+        """Paths of all audio files for a cached audio_dict."""
+        return get_audio_paths(audio_dict)
+
+    def touch(self, audio_dict: dict):
+        """Record an access of cached audio."""
+        audio_dict[AUDIO_LAST_ACCESS_KEY] = time.time()
+        audio_dict[AUDIO_ACCESS_COUNT_KEY] = int(audio_dict.get(AUDIO_ACCESS_COUNT_KEY, 0)) + 1
+
+    def get_nested_folders(self, folder: str):
+        """Get the other cache folders inside a folder, whose files count toward their own budget instead."""
+        return [nested_folder for nested_folder in self.folders
+                if nested_folder != folder and nested_folder.startswith(folder)]
+
+    def select_evictions(self, cache_index: ChimeTTSCacheIndex):
+        """Select the cached audio_dicts to remove so every budget is met, by key (runs in the cache index's thread)."""
+        self.size_bytes = cache_index.get_total_size()
+
+        evicted = {}
+        evicted_bytes = 0
+
+        # Folder budgets
+        for folder, max_bytes in self.folder_max_bytes.items():
+            nested_folders = self.get_nested_folders(folder)
+            folder_bytes = cache_index.get_total_size(folder, nested_folders)
+            if folder_bytes <= max_bytes:
+                continue
+            for key, size, audio_dict in cache_index.get_eviction_candidates(self.policy, folder, nested_folders):
+                if folder_bytes <= max_bytes:
+                    break
+                folder_bytes -= size
+                evicted_bytes += size
+                evicted[key] = audio_dict
+
+        # Overall budget
+        total_bytes = self.size_bytes - evicted_bytes
+        if self.max_bytes > 0 and total_bytes > self.max_bytes:
+            for key, size, audio_dict in cache_index.get_eviction_candidates(self.policy):
+                if total_bytes <= self.max_bytes:
+                    break
+                if key in evicted:
+                    continue
+                total_bytes -= size
+                evicted_bytes += size
+                evicted[key] = audio_dict
+
+        if len(evicted) > 0:
+            self.size_bytes -= evicted_bytes
+            self.metrics.increment(METRIC_DISK_CACHE_EVICTIONS, len(evicted))
+            _LOGGER.debug("Evicting %s cached audio files (%s bytes) to meet the disk cache budgets",
+                          str(len(evicted)), str(evicted_bytes))
+        return evicted
@@ -1,14 +1,16 @@
 """Audio helper functions for Chime TTS."""
 
+import asyncio
 import logging
 import time
 import tempfile
 import os
 import hashlib
-import subprocess
 import shutil
+import uuid
 from io import BytesIO
 import re
+import mutagen
 import yaml
 import requests
 from pydub import AudioSegment
@@ -29,13 +31,36 @@ from .const import (
     MP3_PRESET_CUSTOM_KEY,
     TEMP_CHIMES_PATH_KEY,
     AUDIO_PATH_KEY,
-    AUDIO_DURATION_KEY
+    AUDIO_DURATION_KEY,
+    AUDIO_FORMAT_KEY,
+    PRIORITY_LEVELS,
+    PRIORITY_DEFAULT,
+    SPEED_ENGINE_WSOLA,
+    SPEED_ENGINE_DEFAULT,
+    FFMPEG_MAX_PROCESSES,
+    FFMPEG_PCM_FORMATS,
+    FILE_HASH_CHUNK_SIZE,
 )
+from .audio_executor import ChimeTTSAudioExecutor
+from .mixer import get_audio_format, normalize_audio
+from .time_stretch import time_stretch
 _LOGGER = logging.getLogger(__name__)
 
 class ChimeTTSHelper:
     """Helper functions for Chime TTS."""
 
+    def __init__(self, audio_executor: ChimeTTSAudioExecutor):
+        """Initialize the helper functions."""
+        self.audio_executor = audio_executor
+        self.ffmpeg_semaphore = asyncio.Semaphore(FFMPEG_MAX_PROCESSES)
+
+    def __getstate__(self):
+        """Exclude the audio executor when helper functions are sent to render worker processes."""
+        state = self.__dict__.copy()
+        state["audio_executor"] = None
+        state["ffmpeg_semaphore"] = None
+        return state
+
     def parse_options_yaml(self, data):
         """Parse TTS service options YAML into dict object."""
         options = {}
@@ -61,36 +86,39 @@ class ChimeTTSHelper:
 
         return options
 
+    def parse_render_params(self, data):
+        """Parse the service parameters which determine the generated audio."""
+        return {
+            "chime_path": str(data.get("chime_path", "")),
+            "end_chime_path": str(data.get("end_chime_path", "")),
+            "offset": float(data.get("delay", data.get("offset", DEFAULT_DELAY_MS))),
+            "message": str(data.get("message", "")),
+            "tts_platform": str(data.get("tts_platform", "")),
+            "tts_playback_speed": float(data.get("tts_playback_speed", 100)),
+            "language": data.get("language", None),
+        }
+
     async def async_parse_params(self, data, hass: HomeAssistant):
         """Parse TTS service parameters."""
         entity_ids = self.parse_entity_ids(data, hass)
-        chime_path =str(data.get("chime_path", ""))
-        end_chime_path = str(data.get("end_chime_path", ""))
-        offset = float(data.get("delay", data.get("offset", DEFAULT_DELAY_MS)))
+        render_params = self.parse_render_params(data)
+        chime_path = render_params["chime_path"]
+        end_chime_path = render_params["end_chime_path"]
+        offset = render_params["offset"]
         final_delay = float(data.get("final_delay", 0))
-        message = str(data.get("message", ""))
-        tts_platform = str(data.get("tts_platform", ""))
-        tts_playback_speed = float(data.get("tts_playback_speed", 100))
+        message = render_params["message"]
+        tts_platform = render_params["tts_platform"]
+        tts_playback_speed = render_params["tts_playback_speed"]
         volume_level = float(data.get(ATTR_MEDIA_VOLUME_LEVEL, -1))
-        media_players_array = await self.async_initialize_media_players(
-            hass, entity_ids, volume_level
-        )
         join_players = data.get("join_players", False)
         unjoin_players = data.get("unjoin_players", False)
-        language = data.get("language", None)
+        language = render_params["language"]
         cache = data.get("cache", False)
         announce = data.get("announce", False)
 
         # FFmpeg arguments
-        ffmpeg_args = data.get("audio_conversion", None)
-        if ffmpeg_args is not None:
-            if data.get("audio_conversion", None).lower() == "alexa":
-                ffmpeg_args = ALEXA_FFMPEG_ARGS
-            else:
-                if data.get("audio_conversion", None).lower() == "custom":
-                    ffmpeg_args = None
-                else:
-                    data.get("audio_conversion", None)
+        ffmpeg_args = self.parse_ffmpeg_args(data.get("audio_conversion", None))
+        output_profiles = self.parse_output_profiles(data, entity_ids, ffmpeg_args, hass)
 
         params = {
             "entity_ids": entity_ids,
@@ -100,7 +128,6 @@ class ChimeTTSHelper:
             "cache": cache,
             "offset": offset,
             "final_delay": final_delay,
-            "media_players_array": media_players_array,
             "message": message,
             "language": language,
             "tts_platform": tts_platform,
@@ -110,21 +137,70 @@ class ChimeTTSHelper:
             "join_players": join_players,
             "unjoin_players": unjoin_players,
             "ffmpeg_args": ffmpeg_args,
+            "output_profiles": output_profiles,
         }
 
         _LOGGER.debug("----- General Parameters -----")
         for key, value in params.items():
-            if value is not None and value != "" and key not in ["hass", "media_players_array"]:
+            if value is not None and value != "" and key not in ["hass"]:
                 _LOGGER.debug(" * %s = %s", key, str(value))
 
         return params
 
 
+    def parse_ffmpeg_args(self, audio_conversion):
+        """Parse an audio conversion value into FFmpeg arguments (None for no conversion)."""
+        if audio_conversion is None:
+            return None
+        audio_conversion = str(audio_conversion).strip()
+        if audio_conversion.lower() == "alexa":
+            return ALEXA_FFMPEG_ARGS
+        if audio_conversion.lower() in ["custom", "none", ""]:
+            return None
+        return audio_conversion
+
+    def parse_output_profiles(self, data, entity_ids, ffmpeg_args, hass):
+        """Parse the audio conversion for each media player, from profiles keyed by entity_id or platform."""
+        output_profiles = data.get("output_profiles", None)
+        if output_profiles is None or len(entity_ids) == 0:
+            return None
+        if isinstance(output_profiles, str):
+            try:
+                output_profiles = yaml.safe_load(output_profiles)
+            except yaml.YAMLError as error:
+                _LOGGER.error("Error parsing output profiles YAML: %s", error)
+                return None
+        if not isinstance(output_profiles, dict):
+            _LOGGER.warning("Output profiles must be a dictionary of entity_ids and/or platforms")
+            return None
+
+        entity_registry = hass.data["entity_registry"]
+        entity_ffmpeg_args = {}
+        for entity_id in entity_ids:
+            entity = entity_registry.async_get(entity_id)
+            platform = entity.platform if entity is not None else None
+            if entity_id in output_profiles:
+                entity_ffmpeg_args[entity_id] = self.parse_ffmpeg_args(output_profiles[entity_id])
+            elif platform is not None and platform in output_profiles:
+                entity_ffmpeg_args[entity_id] = self.parse_ffmpeg_args(output_profiles[platform])
+            else:
+                entity_ffmpeg_args[entity_id] = ffmpeg_args
+        return entity_ffmpeg_args
+
+    def get_renditions(self, output_profiles: dict):
+        """Group media players by the FFmpeg arguments (or "" for unconverted audio) of their rendition."""
+        renditions = {}
+        for entity_id, ffmpeg_args in output_profiles.items():
+            renditions.setdefault(ffmpeg_args or "", []).append(entity_id)
+        return renditions
+
     def parse_entity_ids(self, data, hass):
         """Parse media_player entity_ids into list object."""
         entity_ids = data.get(CONF_ENTITY_ID, [])
         if isinstance(entity_ids, str):
             entity_ids = entity_ids.split(",")
+        else:
+            entity_ids = list(entity_ids)
 
         # Find all media_player entities associated with device/s specified
         device_ids = data.get("device_id", [])
@@ -142,6 +218,60 @@ class ChimeTTSHelper:
         entity_ids = list(set(entity_ids))
         return entity_ids
 
+    def get_queue_lanes(self, data, entity_ids: list, hass: HomeAssistant):
+        """Media players a service call plays on, including the members of groups, joined speakers and areas.
+
+        Returns the set of media players and whether any target could not be
+        resolved, in which case the service call should not share its lane.
+        """
+        lanes = set()
+        unresolved = False
+
+        # Media players in target areas
+        area_ids = data.get("area_id", [])
+        if isinstance(area_ids, str):
+            area_ids = area_ids.split(",")
+        entity_ids = list(entity_ids)
+        if len(area_ids) > 0:
+            entity_registry = hass.data["entity_registry"]
+            device_registry = hass.data["device_registry"]
+            for area_id in area_ids:
+                area_device_ids = {device.id for device in device_registry.devices.values()
+                                   if device.area_id == area_id}
+                area_entity_ids = [
+                    entity.entity_id
+                    for entity in entity_registry.entities.values()
+                    if entity.entity_id.startswith("media_player.")
+                    and (entity.area_id == area_id
+                         or (entity.area_id is None and entity.device_id in area_device_ids))
+                ]
+                if len(area_entity_ids) == 0:
+                    unresolved = True
+                entity_ids.extend(area_entity_ids)
+
+        # Members of media player groups and joined speakers
+        while len(entity_ids) > 0:
+            entity_id = entity_ids.pop()
+            if entity_id in lanes:
+                continue
+            lanes.add(entity_id)
+            state = hass.states.get(entity_id)
+            if state is None:
+                unresolved = True
+                continue
+            for attribute in ["entity_id", "group_members"]:
+                members = state.attributes.get(attribute) or []
+                entity_ids.extend([members] if isinstance(members, str) else members)
+        return lanes, unresolved
+
+    def parse_priority(self, data):
+        """Parse the service call priority level."""
+        priority = str(data.get("priority", PRIORITY_DEFAULT)).lower()
+        if priority not in PRIORITY_LEVELS:
+            _LOGGER.warning("Invalid priority '%s'. Using '%s' priority instead", priority, PRIORITY_DEFAULT)
+            priority = PRIORITY_DEFAULT
+        return priority
+
     def parse_message(self, message_string):
         """Parse the message string/YAML object into segments dictionary."""
         message_string = str(message_string)
@@ -276,12 +406,12 @@ class ChimeTTSHelper:
             # Use cached version?
             if cache is True:
                 local_file = self.get_downloaded_chime_path(folder=temp_chimes_path, url=chime_path)
-                if local_file is not None:
+                if await self.audio_executor.async_run(os.path.exists, local_file):
                     return local_file
                 _LOGGER.debug(" - Chime does not exist in cache")
 
             # Download from URL
-            audio_dict = await self.async_download_file(hass, chime_path, temp_chimes_path)
+            audio_dict = await self.async_download_file(hass, chime_path, temp_chimes_path, data.get(AUDIO_FORMAT_KEY))
             if audio_dict is not None:
                 _LOGGER.debug(" - Chime downloaded successfully")
                 # # Store audio data in cache
@@ -294,122 +424,259 @@ class ChimeTTSHelper:
             _LOGGER.warning(" - Unable to downloaded chime %s", chime_path)
             return None
 
-        chime_path = self.validate_path(hass, chime_path)
+        chime_path = await self.audio_executor.async_run(self.validate_path, hass, chime_path)
         return chime_path
 
-    def ffmpeg_convert_from_audio_segment(self,
-                                          audio_segment: AudioSegment,
-                                          ffmpeg_args: str,
-                                          folder: str):
-        """Convert pydub AudioSegment with FFmpeg and provided arguments."""
-        # Save to temp file
-        temp_filename = "temp_segment.mp3"
-        temp_audio_file = self.save_audio_to_folder(audio=audio_segment,
-                                                    folder=folder,
-                                                    file_name=temp_filename)
-        if temp_audio_file is None:
-            _LOGGER.warning("ffmpeg_convert_from_audio_segment - Unable to store audio segment")
+    def get_ffmpeg_output_format(self, ffmpeg_args: list):
+        """File type of the FFmpeg output (the -f option), defaulting to mp3."""
+        if "-f" in ffmpeg_args:
+            index = ffmpeg_args.index("-f")
+            if index + 1 < len(ffmpeg_args):
+                return ffmpeg_args[index + 1]
+        return "mp3"
+
+    def get_ffmpeg_pcm_args(self, audio_segment: AudioSegment):
+        """FFmpeg input arguments describing an AudioSegment's raw PCM data."""
+        return [
+            "-f", FFMPEG_PCM_FORMATS.get(audio_segment.sample_width, "s16le"),
+            "-ar", str(audio_segment.frame_rate),
+            "-ac", str(audio_segment.channels),
+        ]
+
+    async def async_run_ffmpeg(self, ffmpeg_args: list, input_data: bytes):
+        """Run FFmpeg, piping data to stdin, and return stdout (or None if FFmpeg failed)."""
+        ffmpeg_cmd = ["ffmpeg", "-hide_banner", "-loglevel", "error", *ffmpeg_args]
+        async with self.ffmpeg_semaphore:
+            try:
+                ffmpeg_process = await asyncio.create_subprocess_exec(*ffmpeg_cmd,
+                                                                      stdin=asyncio.subprocess.PIPE,
+                                                                      stdout=asyncio.subprocess.PIPE,
+                                                                      stderr=asyncio.subprocess.PIPE)
+                output, error_output = await ffmpeg_process.communicate(input_data)
+            except Exception as error:
+                _LOGGER.error("FFmpeg unexpected error: %s FFmpeg options: %s",
+                              error, " ".join(ffmpeg_cmd))
+                return None
+
+        if ffmpeg_process.returncode != 0:
+            _LOGGER.error("%s, %s, stderr=%s",
+                          str(ffmpeg_process.returncode),
+                          " ".join(ffmpeg_cmd),
+                          error_output.decode("utf-8", errors="replace"))
+            return None
+        return output
+
+    async def async_ffmpeg_convert_audio_segment(self,
+                                                 audio_segment: AudioSegment,
+                                                 ffmpeg_args: str):
+        """Convert pydub AudioSegment with FFmpeg and provided arguments, via pipes."""
+        if audio_segment is None:
+            return audio_segment
+        ffmpeg_args = ffmpeg_args.split()
+        output_format = self.get_ffmpeg_output_format(ffmpeg_args)
+        if "-f" not in ffmpeg_args:
+            ffmpeg_args += ["-f", output_format]
+
+        # Convert the raw audio with the provided arguments
+        converted_audio = await self.async_run_ffmpeg(
+            [*self.get_ffmpeg_pcm_args(audio_segment), "-i", "pipe:0",
+             *ffmpeg_args, "pipe:1"],
+            audio_segment.raw_data)
+        if converted_audio is None or len(converted_audio) == 0:
+            _LOGGER.warning("ffmpeg_convert_audio_segment - Unable convert audio segment")
             return audio_segment
 
-        # Convert with FFmpeg
-        converted_audio_file = self.ffmpeg_convert_from_file(temp_audio_file, ffmpeg_args)
-        if converted_audio_file is None or converted_audio_file is False or len(converted_audio_file) < 5:
-            _LOGGER.warning("ffmpeg_convert_from_audio_segment - Unable convert audio segment")
+        # Decode the converted audio back to the original sample format
+        pcm_args = self.get_ffmpeg_pcm_args(audio_segment)
+        converted_pcm = await self.async_run_ffmpeg(
+            ["-f", output_format, "-i", "pipe:0", *pcm_args, "pipe:1"],
+            converted_audio)
+        if converted_pcm is None:
+            _LOGGER.warning("ffmpeg_convert_audio_segment - Unable to load converted audio segment")
             return audio_segment
 
-        # Load new AudioSegment from converted file
+        return AudioSegment(data=converted_pcm,
+                            sample_width=audio_segment.sample_width,
+                            frame_rate=audio_segment.frame_rate,
+                            channels=audio_segment.channels)
+
+    async def async_ffmpeg_convert_to_files(self,
+                                            audio_segment: AudioSegment,
+                                            ffmpeg_args_list: list,
+                                            folder: str,
+                                            content_addressed: bool = True):
+        """Encode pydub AudioSegment into a new file in folder for each set of FFmpeg arguments, with a single FFmpeg process.
+
+        Files are stored by their content, unless content_addressed is False (e.g. audio deleted after playback, which must not share its file with other service calls).
+        """
+        await self.audio_executor.async_run(os.makedirs, folder, exist_ok=True)
+        output_args = []
+        file_paths = []
+        for ffmpeg_args in ffmpeg_args_list:
+            ffmpeg_args = ffmpeg_args.split() if ffmpeg_args else []
+            file_extension = self.get_ffmpeg_output_format(ffmpeg_args)
+            if "-f" not in ffmpeg_args:
+                ffmpeg_args += ["-f", file_extension]
+            file_path = f"{folder}{uuid.uuid4().hex}.{file_extension}"
+            output_args += [*ffmpeg_args, "-y", file_path]
+            file_paths.append(file_path)
+
+        output = await self.async_run_ffmpeg(
+            [*self.get_ffmpeg_pcm_args(audio_segment), "-i", "pipe:0", *output_args],
+            audio_segment.raw_data)
+        if output is None:
+            for file_path in file_paths:
+                await self.audio_executor.async_run(self.delete_file, file_path)
+            return None
+        if not content_addressed:
+            return file_paths
+        return [await self.audio_executor.async_run(self.store_file_by_content, file_path, folder)
+                for file_path in file_paths]
+
+    async def async_ffmpeg_convert_to_file(self,
+                                           audio_segment: AudioSegment,
+                                           ffmpeg_args: str,
+                                           folder: str,
+                                           content_addressed: bool = True):
+        """Encode pydub AudioSegment with FFmpeg and provided arguments straight to a new file in folder."""
+        file_paths = await self.async_ffmpeg_convert_to_files(audio_segment, [ffmpeg_args], folder, content_addressed)
+        return file_paths[0] if file_paths is not None else None
+
+    def get_audio_duration(self, audio, decode: bool = False):
+        """Duration (s) of encoded audio bytes or an audio file, read from its MP3/WAV/etc. headers without decoding (None if unknown).
+
+        With decode, audio whose headers cannot be read is decoded to measure its length instead.
+        """
+        audio_file = None
         try:
-            converted_audio_segment = AudioSegment.from_file(converted_audio_file)
+            audio_file = mutagen.File(BytesIO(audio) if isinstance(audio, bytes) else audio)
         except Exception as error:
-            _LOGGER.warning("ffmpeg_convert_from_audio_segment - Unable to load converted audio segment %s", error)
-            return audio_segment
-
-        # Delete temp file & converted file
-        if os.path.exists(temp_audio_file):
-            try:
-                os.remove(temp_audio_file)
-            except Exception as error:
-                _LOGGER.warning("ffmpeg_convert_from_audio_segment - Unable to delete temp files: %s", error)
-        if os.path.exists(converted_audio_file):
+            _LOGGER.debug(" - Unable to read audio header: %s", error)
+        if audio_file is not None and audio_file.info is not None and audio_file.info.length:
+            return float(audio_file.info.length)
+        if decode:
             try:
-                os.remove(converted_audio_file)
+                audio_segment = AudioSegment.from_file(BytesIO(audio) if isinstance(audio, bytes) else audio)
             except Exception as error:
-                _LOGGER.warning("ffmpeg_convert_from_audio_segment - Unable to delete temp files: %s", error)
-
-        if converted_audio_segment is not None:
-            return converted_audio_segment
-
-        return audio_segment
-
+                _LOGGER.debug(" - Unable to decode audio: %s", error)
+                return None
+            return float(len(audio_segment) / 1000.0)
+        return None
 
-    def ffmpeg_convert_from_file(self, file_path: str, ffmpeg_args: str):
-        """Convert audio file with FFmpeg and provided arguments."""
+    def change_playback_speed(self,
+                              audio: AudioSegment,
+                              playback_speed: float = 100,
+                              engine: str = SPEED_ENGINE_DEFAULT):
+        """Change the playback speed (percentage) of audio."""
+        if audio is None or playback_speed == 100:
+            return audio
+        _LOGGER.debug(
+            " -  ...changing TTS playback speed to %s percent",
+            str(playback_speed),
+        )
+        speed = float(playback_speed / 100)
+        if engine == SPEED_ENGINE_WSOLA:
+            return time_stretch(audio, speed)
+        if playback_speed > 150:
+            return audio.speedup(playback_speed=speed, chunk_size=50)
+        return audio.speedup(playback_speed=speed)
+
+    def delete_file(self, file_path: str):
+        """Delete a file if it exists. Return True if the file no longer exists."""
+        if file_path is None or not os.path.exists(file_path):
+            return True
         try:
-            ffmpeg_cmd = [
-                'ffmpeg',
-                '-i', file_path,
-                *ffmpeg_args.split()
-            ]
-
-            # Save to a specific file type (arguement option -f)
+            os.remove(file_path)
+        except OSError as error:
+            _LOGGER.warning(" - Unable to delete file '%s': %s", file_path, error)
+        return not os.path.exists(file_path)
+
+    def delete_files(self, file_paths: list):
+        """Delete files. Return the number of files deleted, bytes freed and files which could not be deleted."""
+        deleted_count = 0
+        bytes_freed = 0
+        failed_count = 0
+        for file_path in file_paths:
             try:
-                # Use the file type specific by the -f option (eg: -f wav)
-                index = ffmpeg_cmd.index('-f')
-                file_extension = ffmpeg_cmd[index+1]
-                converted_file_path = file_path.replace(".mp3", f".{file_extension}")
-            except Exception:
-                # Use the default file type of mp3
-                converted_file_path = file_path.replace(".mp3", "_converted.mp3")
-            ffmpeg_cmd.append(converted_file_path)
-
-            # Overwrite output file if it already exists
-            ffmpeg_cmd.append('-y')
-
-            # Convert the audil file
-            ffmpeg_cmd_string = " ".join(ffmpeg_cmd)
-            ffmpeg_process = subprocess.Popen(ffmpeg_cmd,
-                                              stdin=subprocess.PIPE,
-                                              stdout=subprocess.PIPE,
-                                              stderr=subprocess.PIPE)
-            converted_file, error_output = ffmpeg_process.communicate()
-
-            if ffmpeg_process.returncode != 0:
-                error_message = error_output.decode('utf-8')
-                _LOGGER.error("%s, %s, output=%s, stderr=%s",
-                               str(ffmpeg_process.returncode),
-                               ' '.join(ffmpeg_cmd),
-                               converted_file_path,
-                               str(error_message))
-                return False
-
-            # Replace original with converted file
-            if converted_file_path == file_path.replace(".mp3", "_converted.mp3"):
-                try:
-                    shutil.move(converted_file_path, file_path)
-                    return file_path
-                except Exception as error:
-                    _LOGGER.error("Error renaming file %s to %s. Error: %s. FFmpeg options: %s",
-                                   file_path, converted_file_path, error, ffmpeg_cmd_string)
-                    return False
-
-            return converted_file_path
-
-        except subprocess.CalledProcessError as error:
-            _LOGGER.error("FFmpeg subproces error: %s FFmpeg options: %s",
-                           error, ffmpeg_cmd_string)
+                file_size = os.path.getsize(file_path)
+                os.remove(file_path)
+            except FileNotFoundError:
+                continue
+            except OSError as error:
+                _LOGGER.warning(" - Unable to delete file '%s': %s", file_path, error)
+                failed_count += 1
+                continue
+            deleted_count += 1
+            bytes_freed += file_size
+        return deleted_count, bytes_freed, failed_count
+
+    def get_file_sizes(self, file_paths: list):
+        """Sizes (bytes) of the files which exist, keyed by file path."""
+        file_sizes = {}
+        for file_path in file_paths:
+            try:
+                file_sizes[file_path] = os.path.getsize(file_path)
+            except OSError:
+                continue
+        return file_sizes
 
-        except Exception as error:
-            _LOGGER.error("FFmpeg unexpected error: %s FFmpeg options: %s",
-                           error, ffmpeg_cmd_string)
+    def get_missing_files(self, file_paths: list):
+        """File paths which do not exist."""
+        return [file_path for file_path in file_paths if not os.path.exists(file_path)]
 
-        return file_path
+    def get_file_hash(self, file_path: str):
+        """SHA-256 hash of a file's content."""
+        hash_object = hashlib.sha256()
+        with open(file_path, "rb") as file:
+            for chunk in iter(lambda: file.read(FILE_HASH_CHUNK_SIZE), b""):
+                hash_object.update(chunk)
+        return hash_object.hexdigest()
+
+    def get_content_path(self, folder: str, content_hash: str, file_extension: str):
+        """Path in folder for a file named after its content hash, sharded by the hash's first 2 and next 2 characters."""
+        return f"{folder}{content_hash[0:2]}/{content_hash[2:4]}/{content_hash}.{file_extension}"
+
+    def store_file_by_content(self, file_path: str, folder: str):
+        """Move a new file to its content addressed path in folder, or remove it if identical content is already stored there. Return the stored file's path."""
+        file_extension = os.path.splitext(file_path)[1].lstrip(".") or "mp3"
+        try:
+            content_path = self.get_content_path(folder, self.get_file_hash(file_path), file_extension)
+            if os.path.exists(content_path):
+                _LOGGER.debug(" - Identical audio already stored at: %s", content_path)
+                os.remove(file_path)
+            else:
+                os.makedirs(os.path.dirname(content_path), exist_ok=True)
+                os.replace(file_path, content_path)
+        except OSError as error:
+            _LOGGER.warning(" - Unable to store file '%s' by its content: %s", file_path, error)
+            return file_path
+        return content_path
+
+    def link_file(self, file_path: str, folder: str, source_folder: str):
+        """Hard link a file from source_folder into folder at the same relative path, copying it if the folders are on different file systems. Return the new path."""
+        link_path = folder + os.path.relpath(file_path, source_folder)
+        if os.path.exists(link_path):
+            return link_path
+        try:
+            os.makedirs(os.path.dirname(link_path), exist_ok=True)
+            if os.path.lexists(link_path):
+                os.remove(link_path)
+            try:
+                os.link(file_path, link_path)
+            except OSError:
+                # Not symlinked, as Home Assistant does not serve symlinks pointing outside its www folder
+                shutil.copyfile(file_path, link_path)
+        except OSError as error:
+            _LOGGER.warning(" - Unable to add file '%s' to folder '%s': %s", file_path, folder, error)
+            return None
+        return link_path
 
     def get_downloaded_chime_path(self, folder: str, url: str):
         """Local file path string for chime URL in local folder."""
         return folder + ("" if folder.endswith("/") else "/") + re.sub(r'[\/:*?"<>|]', '_', url.replace("https://", "").replace("http://", ""))
 
-    def save_audio_to_folder(self, audio, folder, file_name: str = None):
-        """Save audio to local folder."""
+    def save_audio_to_folder(self, audio, folder, file_name: str = None, content_addressed: bool = True):
+        """Save audio to local folder (unnamed audio is stored by its content, unless content_addressed is False)."""
 
         # Create folder if it doesn't already exist
         if os.path.exists(folder) is False:
@@ -435,6 +702,8 @@ class ChimeTTSHelper:
                 ) as temp_obj:
                     audio_full_path = temp_obj.name
                 audio.export(audio_full_path, format="mp3")
+                if content_addressed:
+                    audio_full_path = self.store_file_by_content(audio_full_path, folder)
                 _LOGGER.debug(" - File saved successfully")
             except Exception as error:
                 _LOGGER.warning(
@@ -565,8 +834,8 @@ class ChimeTTSHelper:
             return False
         return media_players_array
 
-    async def async_download_file(self, hass: HomeAssistant, url, folder):
-        """Download a file and save locally."""
+    async def async_download_file(self, hass: HomeAssistant, url, folder, audio_format: dict = None):
+        """Download a file and save locally (normalised to audio_format, if provided)."""
         try:
             _LOGGER.debug("Downloading chime at URL: %s", url)
             response = await hass.async_add_executor_job(requests.get, url)
@@ -594,23 +863,63 @@ class ChimeTTSHelper:
         content_type = response.headers.get('Content-Type', '')
         if 'audio' in content_type:
             _LOGGER.debug(" - Audio downloaded successfully")
-            file_name, file_extension = os.path.splitext(url)
-            audio_content = AudioSegment.from_file(BytesIO(response.content),
-                                                   format=file_extension.replace(".", ""))
-            if audio_content is not None:
-                audio_file_path = self.save_audio_to_folder(audio=audio_content,
-                                                            folder=folder,
-                                                            file_name=url)
-                audio_duration = float(len(audio_content) / 1000)
-                return {
-                    AUDIO_PATH_KEY: audio_file_path,
-                    AUDIO_DURATION_KEY: audio_duration
-                }
+            return await self.audio_executor.async_run(self.save_downloaded_audio,
+                                                       response.content,
+                                                       url,
+                                                       folder,
+                                                       audio_format)
         else:
             _LOGGER.warning(" - Unable to extract audio from URL with content-type '%s'",
                             str(content_type))
         return None
 
+    def save_downloaded_audio(self, content: bytes, url: str, folder: str, audio_format: dict = None):
+        """Save downloaded audio to a local folder, converted once to audio_format so it is not resampled whenever it is loaded.
+
+        Audio already in audio_format (or with no audio_format) whose headers can be read is saved as is.
+        """
+        audio_duration = self.get_audio_duration(content)
+        audio_content = None
+        file_name, file_extension = os.path.splitext(url)
+        if audio_format is not None or audio_duration is None:
+            try:
+                audio_content = AudioSegment.from_file(BytesIO(content),
+                                                       format=file_extension.replace(".", "") or None)
+            except Exception as error:
+                _LOGGER.warning("Unable to decode the downloaded file: %s", error)
+                return None
+            if audio_format is not None and get_audio_format(audio_content) != audio_format:
+                _LOGGER.debug(" - Converting downloaded audio to the configured audio format")
+                audio_content = normalize_audio(audio_content, audio_format)
+            elif audio_duration is not None:
+                audio_content = None
+
+        if audio_content is None:
+            # Save the downloaded file as is
+            try:
+                os.makedirs(folder, exist_ok=True)
+                audio_file_path = self.get_downloaded_chime_path(url=url, folder=folder)
+                with open(audio_file_path, "wb") as audio_file:
+                    audio_file.write(content)
+            except OSError as error:
+                _LOGGER.warning("An error occurred when saving the downloaded file: %s", error)
+                return None
+        else:
+            # Save as WAV or MP3, keeping the file type the URL's extension claims for WAV files
+            try:
+                os.makedirs(folder, exist_ok=True)
+                audio_file_path = self.get_downloaded_chime_path(url=url, folder=folder)
+                audio_content.export(audio_file_path,
+                                     format="wav" if file_extension.lower() == ".wav" else "mp3")
+            except Exception as error:
+                _LOGGER.warning("An error occurred when saving the downloaded file: %s", error)
+                return None
+            audio_duration = float(len(audio_content) / 1000)
+        return {
+            AUDIO_PATH_KEY: audio_file_path,
+            AUDIO_DURATION_KEY: audio_duration
+        }
+
     def get_hash_for_string(self, string):
         """Generate a has for a given string."""
         hash_object = hashlib.sha256()
@@ -0,0 +1,76 @@
+"""Chime TTS queue and pipeline metrics."""
+
+import math
+from collections import deque
+
+from .const import METRICS_WINDOW_SIZE
+
+class ChimeTTSMetrics:
+    """Rolling timing samples and counters for the Chime TTS queue and render pipeline."""
+
+    def __init__(self, window_size: int = METRICS_WINDOW_SIZE):
+        """Initialize the metrics."""
+        self.window_size = window_size
+        self.samples = {}
+        self.counters = {}
+        self.gauges = {}
+
+    def record(self, key: str, value: float):
+        """Add a sample (e.g. a duration in ms) to a metric's rolling window."""
+        if key not in self.samples:
+            self.samples[key] = deque(maxlen=self.window_size)
+        self.samples[key].append(float(value))
+
+    def increment(self, key: str, amount: int = 1):
+        """Increment a counter."""
+        self.counters[key] = self.counters.get(key, 0) + amount
+
+    def get_counter(self, key: str):
+        """Return the current value of a counter."""
+        return self.counters.get(key, 0)
+
+    def register_gauge(self, key: str, value_function):
+        """Register a function returning the current value of a gauge (e.g. the queue depth)."""
+        self.gauges[key] = value_function
+
+    def get_gauge(self, key: str):
+        """Return the current value of a gauge."""
+        value_function = self.gauges.get(key)
+        if value_function is None:
+            return None
+        return value_function()
+
+    def get_percentile(self, key: str, percentile: float):
+        """Nearest-rank percentile of a metric's rolling window, or None if there are no samples."""
+        values = sorted(self.samples.get(key, []))
+        if len(values) == 0:
+            return None
+        rank = max(1, math.ceil(percentile / 100 * len(values)))
+        return round(values[rank - 1], 1)
+
+    def get_stats(self, key: str):
+        """Summary statistics of a metric's rolling window."""
+        values = self.samples.get(key, [])
+        return {
+            "count": len(values),
+            "last": round(values[-1], 1) if len(values) > 0 else None,
+            "p50": self.get_percentile(key, 50),
+            "p95": self.get_percentile(key, 95),
+            "p99": self.get_percentile(key, 99),
+        }
+
+    def get_ratio(self, hits_key: str, misses_key: str):
+        """Hit ratio (%) between two counters, or None if neither has been incremented."""
+        hits = self.get_counter(hits_key)
+        total = hits + self.get_counter(misses_key)
+        if total == 0:
+            return None
+        return round(hits / total * 100, 1)
+
+    def as_dict(self):
+        """All metrics as a dictionary (used for diagnostics)."""
+        return {
+            "samples": {key: self.get_stats(key) for key in sorted(self.samples)},
+            "counters": dict(self.counters),
+            "gauges": {key: self.get_gauge(key) for key in sorted(self.gauges)},
+        }
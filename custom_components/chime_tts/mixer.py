@@ -0,0 +1,104 @@
+"""Timeline mixing of audio segments for Chime TTS."""
+
+import numpy as np
+from pydub import AudioSegment
+
+# Sample types of AudioSegment.raw_data. Unlike 8-bit WAV, pydub holds 8-bit
+# samples as signed bytes (biasing them by 128 when reading and writing WAV).
+SAMPLE_TYPES = {
+    1: np.int8,
+    2: np.int16,
+    4: np.int32,
+}
+
+class ChimeTTSTimeline:
+    """Audio clips placed at positions (ms) on a timeline, mixed into a single buffer once all are added."""
+
+    def __init__(self):
+        """Initialize an empty timeline."""
+        self.positions = []
+        self.clips = []
+        self.length_ms = 0
+        self.is_empty = True
+
+    def add(self, audio: AudioSegment, offset: int = 0):
+        """Add audio after the current end of the timeline with a delay (if >0) or overlay (if <0)."""
+        if audio is None:
+            return
+        if self.is_empty:
+            position = 0
+        elif offset < 0:
+            position = max(0, self.length_ms - abs(offset))
+        else:
+            position = self.length_ms + offset
+        self.positions.append(position)
+        self.clips.append(audio)
+        self.length_ms = max(self.length_ms, position + len(audio))
+        self.is_empty = False
+
+    def add_silence(self, duration_ms: float):
+        """Extend the timeline with silence."""
+        self.length_ms += duration_ms
+        self.is_empty = False
+
+    def get_clips(self):
+        """Positions, length and clips as arguments for mix_audio."""
+        return [list(self.positions), self.length_ms, *self.clips]
+
+
+def get_audio_format(audio: AudioSegment):
+    """Sample rate, channel count and sample width of audio."""
+    return {
+        "frame_rate": audio.frame_rate,
+        "channels": audio.channels,
+        "sample_width": audio.sample_width,
+    }
+
+
+def normalize_audio(audio: AudioSegment, audio_format: dict):
+    """Convert audio to the given format, if it does not already match."""
+    if audio is None or get_audio_format(audio) == audio_format:
+        return audio
+    return (audio.set_frame_rate(audio_format["frame_rate"])
+            .set_channels(audio_format["channels"])
+            .set_sample_width(audio_format["sample_width"]))
+
+
+def mix_audio(positions: list, length_ms: float, *clips: AudioSegment):
+    """Mix clips into one buffer at their positions (ms), clipping the summed samples."""
+    if len(clips) == 0:
+        if length_ms > 0:
+            return AudioSegment.silent(duration=length_ms)
+        return None
+
+    # Common output format (as pydub uses when combining segments). Clips are
+    # normalised to the configured audio format when they are loaded, so no
+    # conversion is normally needed here.
+    frame_rate = max(clip.frame_rate for clip in clips)
+    channels = max(clip.channels for clip in clips)
+    sample_width = max(clip.sample_width for clip in clips)
+    if sample_width not in SAMPLE_TYPES:
+        sample_width = 4
+    sample_type = SAMPLE_TYPES[sample_width]
+    sample_info = np.iinfo(sample_type)
+
+    frames = []
+    total_frames = int(round(length_ms * frame_rate / 1000))
+    for position, clip in zip(positions, clips):
+        clip = clip.set_frame_rate(frame_rate).set_channels(channels).set_sample_width(sample_width)
+        samples = np.frombuffer(clip.raw_data, dtype=sample_type)
+        start_frame = int(round(position * frame_rate / 1000))
+        frames.append((start_frame, samples))
+        total_frames = max(total_frames, start_frame + len(samples) // channels)
+
+    # Sum in a wider type, then clip to the sample range
+    output = np.zeros(total_frames * channels, dtype=np.int64 if sample_width == 4 else np.int32)
+    for start_frame, samples in frames:
+        start = start_frame * channels
+        output[start:start + len(samples)] += samples
+    np.clip(output, sample_info.min, sample_info.max, out=output)
+
+    return AudioSegment(data=output.astype(sample_type).tobytes(),
+                        sample_width=sample_width,
+                        frame_rate=frame_rate,
+                        channels=channels)
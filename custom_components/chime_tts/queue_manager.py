@@ -2,84 +2,479 @@
 
 import logging
 import asyncio
+import bisect
+import contextlib
+import itertools
+import time
 
-from .const import QUEUE_TIMEOUT_DEFAULT
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .metrics import ChimeTTSMetrics
+
+from .const import (
+    QUEUE_TIMEOUT_DEFAULT,
+    QUEUE_CONCURRENCY_DEFAULT,
+    QUEUE_DEDUPE_WINDOW_DEFAULT,
+    QUEUE_RENDER_AHEAD_DEFAULT,
+    QUEUE_MAX_DEPTH_DEFAULT,
+    QUEUE_MAX_AGE_DEFAULT,
+    QUEUE_OVERFLOW_POLICY_DEFAULT,
+    QUEUE_OVERFLOW_REJECT_NEWEST,
+    QUEUE_OVERFLOW_DROP_OLDEST,
+    QUEUE_OVERFLOW_DROP_LOWEST_PRIORITY,
+    QUEUE_ALL_TARGETS,
+    METRIC_QUEUE_DEPTH,
+    METRIC_QUEUE_RUNNING,
+    METRIC_QUEUE_WAIT,
+    METRIC_RENDER_TIME,
+    METRIC_PLAYBACK_TIME,
+    METRIC_TIMEOUTS,
+    PRIORITY_LEVELS,
+    PRIORITY_DEFAULT,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
 class ChimeTTSQueueManager:
     """Chime TTS class to manage the service call queue manager."""
 
-    queue = None
-    running_tasks = []
-    timeout = QUEUE_TIMEOUT_DEFAULT
-
-    def __init__(self):
+    def __init__(self, metrics: ChimeTTSMetrics):
         """Initialize the queue manager."""
-        self.semaphore = asyncio.Semaphore(1)  # Use a semaphore to allow only one task at a time
-        self.reset_queue()
+        self.queue = None
+        self.consumer_task = None
+        self.pending = []
+        self.running_tasks = {}
+        self.discard_tasks = set()
+        self.busy_targets = set()
+        self.sequence = itertools.count()
+        self.queued_render_keys = {}
+        self.recent_render_keys = {}
+        self.timeout = QUEUE_TIMEOUT_DEFAULT
+        self.max_concurrency = QUEUE_CONCURRENCY_DEFAULT
+        self.dedupe_window = QUEUE_DEDUPE_WINDOW_DEFAULT
+        self.render_ahead = QUEUE_RENDER_AHEAD_DEFAULT
+        self.max_depth = QUEUE_MAX_DEPTH_DEFAULT
+        self.max_age = QUEUE_MAX_AGE_DEFAULT
+        self.overflow_policy = QUEUE_OVERFLOW_POLICY_DEFAULT
+        self.metrics = metrics
+        self.metrics.register_gauge(METRIC_QUEUE_DEPTH, lambda: len(self.pending))
+        self.metrics.register_gauge(METRIC_QUEUE_RUNNING, lambda: len(self.running_tasks))
+
+    def start(self, hass: HomeAssistant, config_entry: ConfigEntry):
+        """Start the long-lived queue consumer for the config entry."""
+        if self.queue is None:
+            self.reset_queue()
+        if self.consumer_task is not None and not self.consumer_task.done():
+            return
+        self.consumer_task = config_entry.async_create_background_task(
+            hass, self.async_process_queue(), "chime_tts_queue_consumer"
+        )
+        _LOGGER.debug("Queue consumer started")
+        self.dispatch()
+
+    async def async_stop(self):
+        """Stop the queue consumer and running service calls, leaving pending service calls queued."""
+        task = self.consumer_task
+        self.consumer_task = None
+        tasks = list(self.running_tasks)
+        if task is not None and not task.done():
+            tasks.append(task)
+        for running_task in tasks:
+            running_task.cancel()
+        for running_task in tasks:
+            with contextlib.suppress(asyncio.CancelledError):
+                await running_task
+        if task is not None:
+            _LOGGER.debug("Queue consumer stopped")
 
     async def async_process_queue(self):
         """Process the Chime TTS service call queue."""
         while True:
-            async with self.semaphore:
-                service_call = await self.queue.get()
+            service_call = await self.queue.get()
+            self.queue.task_done()
+            if service_call['future'].done():
+                continue
+            if service_call['preempt'] is True:
+                self.preempt(service_call)
+            self.dispatch()
 
-                if service_call is None:
-                    _LOGGER.debug("Queue empty")
-                    break  # Signal to exit the queue processing
+    def get_sort_key(self, service_call: dict):
+        """Order pending service calls by priority, then by the order they were queued."""
+        return (-PRIORITY_LEVELS[service_call['priority']], service_call['sequence'])
 
-                try:
-                    result = await asyncio.wait_for(
-                        service_call['function'](*service_call['args'], **service_call['kwargs']),
-                        timeout=self.timeout
-                    )
-                    service_call['future'].set_result(result)
-                except asyncio.TimeoutError:
-                    service_call['future'].set_exception(Exception("Service call timed out"))
-                except Exception as e:
-                    service_call['future'].set_exception(e)
-
-    async def queue_processor(self):
-        """Continuously process the Chime TTS service call queue."""
-        running_tasks = set()
-        while True:
-            await asyncio.sleep(0.1)  # Adjust the sleep duration as needed
-            if not self.queue.empty():
-                task = asyncio.create_task(self.async_process_queue())
-                running_tasks.add(task)
-                task.add_done_callback(lambda t: running_tasks.remove(t))
-
-    def add_to_queue(self, function, *args, **kwargs):
-        """Add a new service call to the Chime TTS service call queue."""
-        future = asyncio.Future()
+    def preempt(self, service_call: dict):
+        """Interrupt running lower priority service calls playing on the same media players."""
+        priority_level = PRIORITY_LEVELS[service_call['priority']]
+        for running_service_call in self.running_tasks.values():
+            if (
+                PRIORITY_LEVELS[running_service_call['priority']] < priority_level
+                and self.is_overlapping(running_service_call['targets'], service_call['targets'])
+                and running_service_call['interrupt_event'] is not None
+            ):
+                _LOGGER.debug("Interrupting %s priority service call for %s priority service call",
+                              running_service_call['priority'], service_call['priority'])
+                running_service_call['interrupt_event'].set()
+
+    def dispatch(self):
+        """Start every pending service call whose lane is free.
+
+        Pending service calls are ordered by priority, then by the order they
+        were queued. Service calls targeting overlapping sets of media players
+        run in that order, while service calls with disjoint targets run
+        concurrently, up to the configured concurrency limit.
+        """
+        blocked_targets = set()
+        for service_call in list(self.pending):
+            if len(self.running_tasks) >= self.max_concurrency:
+                break
+            targets = service_call['targets']
+            if self.is_overlapping(targets, self.busy_targets | blocked_targets):
+                # Keep later calls to the same media players behind this one
+                blocked_targets |= targets
+                continue
+            self.pending.remove(service_call)
+            self.release_render_key(service_call)
+            self.cancel_expiry(service_call)
+            self.busy_targets |= targets
+            task = asyncio.create_task(self.async_execute_service_call(service_call))
+            self.running_tasks[task] = service_call
+            task.add_done_callback(
+                lambda t, targets=targets: self.on_service_call_done(t, targets)
+            )
+        self.start_renders()
+
+    def is_overlapping(self, targets: set, other_targets: set):
+        """Whether two sets of targets share a media player. Targets which could not be resolved overlap any others."""
+        if len(targets) == 0 or len(other_targets) == 0:
+            return False
+        return (QUEUE_ALL_TARGETS in targets
+                or QUEUE_ALL_TARGETS in other_targets
+                or len(targets & other_targets) > 0)
+
+    def start_renders(self):
+        """Render the audio of the next pending service calls while earlier ones play."""
+        for service_call in self.pending[:self.render_ahead]:
+            self.start_render(service_call)
+
+    def start_render(self, service_call: dict):
+        """Start the render stage of a service call, if it has one and it has not started."""
+        if service_call['render_function'] is None or service_call['render_task'] is not None:
+            return
+        _LOGGER.debug("Rendering %s priority service call", service_call['priority'])
+        service_call['render_task'] = asyncio.create_task(self.async_render(service_call))
+
+    async def async_render(self, service_call: dict):
+        """Run the render stage of a service call."""
+        start_time = time.monotonic()
+        rendered = await service_call['render_function'](*service_call['render_args'])
+        self.metrics.record(METRIC_RENDER_TIME, (time.monotonic() - start_time) * 1000)
+        return rendered
+
+    def discard_render(self, service_call: dict):
+        """Cancel the render stage of a service call removed from the queue, or clean up its result."""
+        render_task = service_call.get('render_task')
+        if render_task is None:
+            return
+        if not render_task.done():
+            render_task.cancel()
+            return
+        if render_task.cancelled() or render_task.exception() is not None:
+            return
+        if service_call['discard_function'] is not None:
+            discard_task = asyncio.create_task(service_call['discard_function'](render_task.result()))
+            self.discard_tasks.add(discard_task)
+            discard_task.add_done_callback(self.discard_tasks.discard)
+
+    def on_service_call_done(self, task, targets: set):
+        """Free the lane of a completed service call and dispatch the next ones."""
+        self.running_tasks.pop(task, None)
+        self.busy_targets -= targets
+        if self.consumer_task is not None:
+            self.dispatch()
+
+    async def async_execute_service_call(self, service_call: dict):
+        """Run a single queued service call and resolve its future."""
+        future = service_call['future']
+        if future.done():
+            return
+
+        wait_time_ms = (time.monotonic() - service_call['enqueued']) * 1000
+        self.metrics.record(METRIC_QUEUE_WAIT, wait_time_ms)
+        self.metrics.record(METRIC_QUEUE_WAIT + "_" + service_call['priority'], wait_time_ms)
+        _LOGGER.debug("%s priority service call started %s ms after being queued",
+                      service_call['priority'].capitalize(), str(round(wait_time_ms, 1)))
+
+        try:
+            result = await asyncio.wait_for(
+                self.async_run_service_call(service_call),
+                timeout=self.timeout
+            )
+            future.set_result(result)
+            if service_call['render_key'] is not None and self.dedupe_window > 0:
+                self.recent_render_keys[service_call['render_key']] = (time.monotonic(), result)
+        except asyncio.TimeoutError:
+            self.metrics.increment(METRIC_TIMEOUTS)
+            future.set_exception(Exception("Service call timed out"))
+        except asyncio.CancelledError:
+            future.set_exception(Exception("Service call cancelled"))
+            raise
+        except Exception as e:
+            future.set_exception(e)
+
+    async def async_run_service_call(self, service_call: dict):
+        """Run a service call's function, after its render stage (if any) completes."""
+        if service_call['render_function'] is None:
+            return await service_call['function'](*service_call['args'], **service_call['kwargs'])
+
+        self.start_render(service_call)
+        rendered = await service_call['render_task']
+        start_time = time.monotonic()
+        result = await service_call['function'](rendered, *service_call['args'], **service_call['kwargs'])
+        self.metrics.record(METRIC_PLAYBACK_TIME, (time.monotonic() - start_time) * 1000)
+        return result
+
+    def add_to_queue(self,
+                     function,
+                     *args,
+                     targets=None,
+                     exclusive: bool = False,
+                     priority: str = PRIORITY_DEFAULT,
+                     preempt: bool = False,
+                     interrupt_event: asyncio.Event = None,
+                     render_key: str = None,
+                     render_function=None,
+                     render_args: tuple = None,
+                     discard_function=None,
+                     tag: str = None,
+                     **kwargs):
+        """Add a new service call to the Chime TTS service call queue.
+
+        `targets` are the media player entity_ids the service call plays on,
+        used to decide which queued service calls may run at the same time.
+        Set `exclusive` when the targets could not all be resolved, so the
+        service call runs alone rather than alongside service calls which may
+        play on the same media players.
+        Service calls with `preempt` set interrupt running lower `priority`
+        service calls on the same targets by setting their `interrupt_event`.
+        Service calls sharing a `render_key` with a service call still waiting
+        in the queue share its future instead of being processed again.
+
+        When a `render_function` is provided, the service call runs as a two
+        stage pipeline: `render_function(*render_args)` may start ahead of time
+        while earlier service calls are still playing, and its result is passed
+        to `function(rendered, *args, **kwargs)` once the service call's turn
+        comes. `render_args` default to `args`. If the service call leaves the
+        queue without playing after its render stage completed, the rendered
+        result is passed to `discard_function(rendered)` to clean it up.
+
+        An optional `tag` lets pending service calls be purged or cancelled
+        as a group.
+        """
         if self.queue is None:
             self.reset_queue()
-        _LOGGER.debug("Adding service call to queue")
-        self.queue.put_nowait({'function': function,
-                               'args': args,
-                               'kwargs': kwargs,
-                               'future': future})
+        if priority not in PRIORITY_LEVELS:
+            priority = PRIORITY_DEFAULT
+
+        if render_key is not None:
+            # Repeat of a service call which has just completed?
+            recent = self.recent_render_keys.get(render_key)
+            if recent is not None and time.monotonic() - recent[0] <= self.dedupe_window:
+                _LOGGER.debug("Suppressing repeat of a service call completed %ss ago",
+                              str(round(time.monotonic() - recent[0], 1)))
+                future = asyncio.get_running_loop().create_future()
+                future.set_result(recent[1])
+                return future
+
+            # Duplicate of a service call waiting in the queue?
+            queued_service_call = self.queued_render_keys.get(render_key)
+            if queued_service_call is not None:
+                _LOGGER.debug("Coalescing service call with an identical queued service call")
+                if PRIORITY_LEVELS[priority] > PRIORITY_LEVELS[queued_service_call['priority']]:
+                    self.set_priority(queued_service_call, priority)
+                return queued_service_call['future']
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        service_call = {'function': function,
+                        'args': args,
+                        'kwargs': kwargs,
+                        'future': future,
+                        'targets': set(targets or []) | ({QUEUE_ALL_TARGETS} if exclusive else set()),
+                        'priority': priority,
+                        'preempt': preempt,
+                        'interrupt_event': interrupt_event,
+                        'tag': tag,
+                        'render_key': render_key,
+                        'render_function': render_function,
+                        'render_args': args if render_args is None else tuple(render_args),
+                        'render_task': None,
+                        'discard_function': discard_function,
+                        'expiry_handle': None,
+                        'sequence': next(self.sequence),
+                        'enqueued': time.monotonic()}
+
+        # Apply backpressure when the queue is full
+        if self.max_depth > 0 and self.consumer_task is not None:
+            self.dispatch()
+        if self.max_depth > 0 and len(self.pending) >= self.max_depth:
+            dropped_service_call = self.get_overflow_service_call(service_call)
+            if dropped_service_call is service_call:
+                _LOGGER.warning("Queue full (%s service calls). Rejecting new service call", str(len(self.pending)))
+                future.set_exception(Exception("Service call queue is full"))
+                return future
+            _LOGGER.warning("Queue full (%s service calls). Dropping %s priority service call",
+                            str(len(self.pending)), dropped_service_call['priority'])
+            self.remove_service_call(dropped_service_call, "dropped from full queue")
+
+        _LOGGER.debug("Adding %s priority service call to queue", priority)
+        if render_key is not None:
+            self.queued_render_keys[render_key] = service_call
+        if self.max_age > 0:
+            service_call['expiry_handle'] = loop.call_later(
+                self.max_age, self.remove_service_call, service_call, "expired"
+            )
+        bisect.insort(self.pending, service_call, key=self.get_sort_key)
+        self.queue.put_nowait(service_call)
 
         return future
 
+    def get_overflow_service_call(self, service_call: dict):
+        """Service call to discard when adding `service_call` to a full queue, based on the overflow policy."""
+        if self.overflow_policy == QUEUE_OVERFLOW_DROP_OLDEST:
+            return min(self.pending, key=lambda pending_call: pending_call['sequence'])
+        if self.overflow_policy == QUEUE_OVERFLOW_DROP_LOWEST_PRIORITY:
+            # Last pending service call = lowest priority, most recently queued
+            lowest_service_call = self.pending[-1]
+            if self.get_sort_key(lowest_service_call) < self.get_sort_key(service_call):
+                return service_call
+            return lowest_service_call
+        return service_call
+
+    def remove_service_call(self, service_call: dict, reason: str):
+        """Remove a service call which has not started from the queue."""
+        if service_call not in self.pending:
+            return False
+        _LOGGER.debug("Removing %s priority service call from queue: %s", service_call['priority'], reason)
+        self.pending.remove(service_call)
+        self.release_render_key(service_call)
+        self.cancel_expiry(service_call)
+        self.discard_render(service_call)
+        if not service_call['future'].done():
+            service_call['future'].set_result(False)
+        return True
+
+    def cancel_expiry(self, service_call: dict):
+        """Cancel the expiry timer of a service call leaving the queue."""
+        if service_call['expiry_handle'] is not None:
+            service_call['expiry_handle'].cancel()
+            service_call['expiry_handle'] = None
+
+    def is_match(self, service_call: dict, targets=None, tag: str = None):
+        """Whether a service call plays on any of `targets` and has the `tag` (when provided).
+
+        The all targets wildcard matches every target, whether it is in the service call's or in `targets`.
+        """
+        if targets:
+            targets = set(targets)
+            if (QUEUE_ALL_TARGETS not in targets
+                    and QUEUE_ALL_TARGETS not in service_call['targets']
+                    and len(service_call['targets'] & targets) == 0):
+                return False
+        if tag and service_call['tag'] != tag:
+            return False
+        return True
+
+    def purge(self, targets=None, tag: str = None):
+        """Remove pending service calls matching the targets and/or tag. Returns the number removed."""
+        removed = 0
+        for service_call in list(self.pending):
+            if self.is_match(service_call, targets, tag) and self.remove_service_call(service_call, "purged"):
+                removed += 1
+        _LOGGER.debug("%s service call(s) purged from the queue", str(removed))
+        return removed
+
+    def cancel(self, targets=None, tag: str = None):
+        """Remove pending and interrupt running service calls matching the targets and/or tag."""
+        removed = self.purge(targets, tag)
+        interrupted = 0
+        for service_call in self.running_tasks.values():
+            if (
+                self.is_match(service_call, targets, tag)
+                and service_call['interrupt_event'] is not None
+                and not service_call['interrupt_event'].is_set()
+            ):
+                service_call['interrupt_event'].set()
+                interrupted += 1
+        _LOGGER.debug("%s running service call(s) cancelled", str(interrupted))
+        return {"removed": removed, "interrupted": interrupted}
+
+    def set_priority(self, service_call: dict, priority: str):
+        """Change the priority of a service call waiting in the queue."""
+        service_call['priority'] = priority
+        if service_call in self.pending:
+            self.pending.remove(service_call)
+            bisect.insort(self.pending, service_call, key=self.get_sort_key)
+
+    def release_render_key(self, service_call: dict):
+        """Stop coalescing new service calls into a service call leaving the queue."""
+        render_key = service_call['render_key']
+        if render_key is not None and self.queued_render_keys.get(render_key) is service_call:
+            del self.queued_render_keys[render_key]
+        # Forget completed service calls outside the suppression window
+        now = time.monotonic()
+        for key, (completed, _) in list(self.recent_render_keys.items()):
+            if now - completed > self.dedupe_window:
+                del self.recent_render_keys[key]
+
     def reset_queue(self):
         """Remove any existing items in the queue and reset."""
-        if self.queue is not None:
+        if self.queue is None:
+            self.queue = asyncio.Queue()
+        else:
+            # Drain in place so a running consumer keeps waiting on the same queue
             while not self.queue.empty():
                 try:
                     self.queue.get_nowait()
                 except asyncio.QueueEmpty:
                     break
-
-        self.queue = asyncio.Queue()
+                self.queue.task_done()
+        for service_call in self.pending:
+            self.discard_render(service_call)
+            self.cancel_expiry(service_call)
+            if not service_call['future'].done():
+                service_call['future'].set_exception(Exception("Service call removed from queue"))
+        self.pending = []
+        self.queued_render_keys = {}
         _LOGGER.debug("Queue reset")
 
-       # Start the queue processor if not already running
-        if not self.running_tasks:
-            task = asyncio.create_task(self.queue_processor())
-            self.running_tasks.append(task)
-
     def set_timeout(self, p_timeout):
         """Set the timeout duration for queued service calls."""
         self.timeout = p_timeout
+
+    def set_max_concurrency(self, p_max_concurrency):
+        """Set the maximum number of service calls processed at the same time."""
+        self.max_concurrency = max(1, int(p_max_concurrency))
+        if self.consumer_task is not None:
+            self.dispatch()
+
+    def set_render_ahead(self, p_render_ahead):
+        """Set the number of pending service calls rendered while earlier service calls play."""
+        self.render_ahead = max(0, int(p_render_ahead))
+
+    def set_limits(self, p_max_depth, p_max_age, p_overflow_policy):
+        """Set the maximum queue depth, the maximum age of pending service calls and the overflow policy."""
+        self.max_depth = max(0, int(p_max_depth))
+        self.max_age = max(0, float(p_max_age))
+        if p_overflow_policy in [QUEUE_OVERFLOW_REJECT_NEWEST,
+                                 QUEUE_OVERFLOW_DROP_OLDEST,
+                                 QUEUE_OVERFLOW_DROP_LOWEST_PRIORITY]:
+            self.overflow_policy = p_overflow_policy
+        else:
+            self.overflow_policy = QUEUE_OVERFLOW_POLICY_DEFAULT
+
+    def set_dedupe_window(self, p_dedupe_window):
+        """Set the number of seconds during which repeats of a completed service call are dropped."""
+        self.dedupe_window = max(0, float(p_dedupe_window))
+        if self.dedupe_window == 0:
+            self.recent_render_keys = {}
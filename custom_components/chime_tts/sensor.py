@@ -0,0 +1,184 @@
+"""Sensor platform exposing Chime TTS queue and pipeline metrics."""
+
+from datetime import timedelta
+
+from homeassistant.components.sensor import (
+    SensorEntity,
+    SensorStateClass,
+)
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import PERCENTAGE, UnitOfTime
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.device_registry import DeviceEntryType
+from homeassistant.helpers.entity import DeviceInfo, EntityCategory
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+
+from .const import (
+    DOMAIN,
+    NAME,
+    VERSION,
+    METRICS_KEY,
+    METRIC_QUEUE_DEPTH,
+    METRIC_QUEUE_RUNNING,
+    METRIC_QUEUE_WAIT,
+    METRIC_RENDER_TIME,
+    METRIC_PLAYBACK_TIME,
+    METRIC_TIMEOUTS,
+    METRIC_CACHE_HITS,
+    METRIC_CACHE_MISSES,
+    METRIC_LOOP_LAG,
+    METRIC_EXECUTOR_JOBS,
+    METRIC_MEMORY_CACHE_HITS,
+    METRIC_MEMORY_CACHE_MISSES,
+    METRIC_MEMORY_CACHE_BYTES,
+    METRIC_DISK_CACHE_BYTES,
+    METRIC_DISK_CACHE_EVICTIONS,
+    PRIORITY_LEVELS,
+)
+from .metrics import ChimeTTSMetrics
+
+SCAN_INTERVAL = timedelta(seconds=10)
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    config_entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Set up the Chime TTS metric sensors."""
+    metrics = hass.data[DOMAIN][METRICS_KEY]
+    async_add_entities(
+        [
+            ChimeTTSQueueDepthSensor(config_entry, metrics),
+            ChimeTTSTimingSensor(config_entry, metrics, METRIC_QUEUE_WAIT, "Queue wait",
+                                 [METRIC_QUEUE_WAIT + "_" + priority for priority in PRIORITY_LEVELS]),
+            ChimeTTSTimingSensor(config_entry, metrics, METRIC_RENDER_TIME, "Render time"),
+            ChimeTTSTimingSensor(config_entry, metrics, METRIC_PLAYBACK_TIME, "Playback time"),
+            ChimeTTSTimeoutsSensor(config_entry, metrics),
+            ChimeTTSCacheHitRatioSensor(config_entry, metrics),
+            ChimeTTSLoopLagSensor(config_entry, metrics),
+        ]
+    )
+
+
+class ChimeTTSMetricSensor(SensorEntity):
+    """Base class for Chime TTS metric sensors.
+
+    Metrics are read in async_update, on the event loop which records them.
+    """
+
+    _attr_has_entity_name = True
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+
+    def __init__(self, config_entry: ConfigEntry, metrics: ChimeTTSMetrics, key: str, name: str):
+        """Initialize the sensor."""
+        self.metrics = metrics
+        self.key = key
+        self._attr_name = name
+        self._attr_unique_id = f"{config_entry.entry_id}_{key}"
+        self._attr_device_info = DeviceInfo(
+            identifiers={(DOMAIN, config_entry.entry_id)},
+            name=NAME,
+            entry_type=DeviceEntryType.SERVICE,
+            sw_version=VERSION,
+        )
+
+
+class ChimeTTSQueueDepthSensor(ChimeTTSMetricSensor):
+    """Number of service calls waiting in the queue."""
+
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_icon = "mdi:tray-full"
+
+    def __init__(self, config_entry: ConfigEntry, metrics: ChimeTTSMetrics):
+        """Initialize the sensor."""
+        super().__init__(config_entry, metrics, METRIC_QUEUE_DEPTH, "Queue depth")
+
+    async def async_update(self) -> None:
+        """Update the queue depth."""
+        self._attr_native_value = self.metrics.get_gauge(METRIC_QUEUE_DEPTH)
+        self._attr_extra_state_attributes = {
+            "running": self.metrics.get_gauge(METRIC_QUEUE_RUNNING),
+        }
+
+
+class ChimeTTSTimingSensor(ChimeTTSMetricSensor):
+    """Rolling 95th percentile of a duration, with p50/p99 attributes."""
+
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_native_unit_of_measurement = UnitOfTime.MILLISECONDS
+    _attr_icon = "mdi:timer-outline"
+
+    def __init__(self,
+                 config_entry: ConfigEntry,
+                 metrics: ChimeTTSMetrics,
+                 key: str,
+                 name: str,
+                 breakdown_keys: list = None):
+        """Initialize the sensor."""
+        super().__init__(config_entry, metrics, key, name)
+        self.breakdown_keys = breakdown_keys or []
+
+    async def async_update(self) -> None:
+        """Update the percentiles."""
+        stats = self.metrics.get_stats(self.key)
+        self._attr_native_value = stats["p95"]
+        attributes = dict(stats)
+        for breakdown_key in self.breakdown_keys:
+            attributes[breakdown_key.replace(self.key + "_", "") + "_p95"] = self.metrics.get_percentile(breakdown_key, 95)
+        self._attr_extra_state_attributes = attributes
+
+
+class ChimeTTSLoopLagSensor(ChimeTTSTimingSensor):
+    """Rolling 95th percentile of how long the event loop was blocked, with the number of running audio jobs."""
+
+    _attr_icon = "mdi:speedometer-slow"
+
+    def __init__(self, config_entry: ConfigEntry, metrics: ChimeTTSMetrics):
+        """Initialize the sensor."""
+        super().__init__(config_entry, metrics, METRIC_LOOP_LAG, "Event loop lag")
+
+    async def async_update(self) -> None:
+        """Update the percentiles and the number of running audio jobs."""
+        await super().async_update()
+        self._attr_extra_state_attributes["executor_jobs"] = self.metrics.get_gauge(METRIC_EXECUTOR_JOBS)
+
+
+class ChimeTTSTimeoutsSensor(ChimeTTSMetricSensor):
+    """Number of service calls which timed out."""
+
+    _attr_state_class = SensorStateClass.TOTAL_INCREASING
+    _attr_icon = "mdi:timer-alert-outline"
+
+    def __init__(self, config_entry: ConfigEntry, metrics: ChimeTTSMetrics):
+        """Initialize the sensor."""
+        super().__init__(config_entry, metrics, METRIC_TIMEOUTS, "Timeouts")
+
+    async def async_update(self) -> None:
+        """Update the number of timeouts."""
+        self._attr_native_value = self.metrics.get_counter(METRIC_TIMEOUTS)
+
+
+class ChimeTTSCacheHitRatioSensor(ChimeTTSMetricSensor):
+    """Percentage of cache lookups which found previously generated audio."""
+
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_native_unit_of_measurement = PERCENTAGE
+    _attr_icon = "mdi:cached"
+
+    def __init__(self, config_entry: ConfigEntry, metrics: ChimeTTSMetrics):
+        """Initialize the sensor."""
+        super().__init__(config_entry, metrics, "cache_hit_ratio", "Cache hit ratio")
+
+    async def async_update(self) -> None:
+        """Update the cache hit ratio."""
+        self._attr_native_value = self.metrics.get_ratio(METRIC_CACHE_HITS, METRIC_CACHE_MISSES)
+        self._attr_extra_state_attributes = {
+            "hits": self.metrics.get_counter(METRIC_CACHE_HITS),
+            "misses": self.metrics.get_counter(METRIC_CACHE_MISSES),
+            "memory_hits": self.metrics.get_counter(METRIC_MEMORY_CACHE_HITS),
+            "memory_misses": self.metrics.get_counter(METRIC_MEMORY_CACHE_MISSES),
+            "memory_bytes": self.metrics.get_gauge(METRIC_MEMORY_CACHE_BYTES),
+            "disk_bytes": self.metrics.get_gauge(METRIC_DISK_CACHE_BYTES),
+            "disk_evictions": self.metrics.get_counter(METRIC_DISK_CACHE_EVICTIONS),
+        }
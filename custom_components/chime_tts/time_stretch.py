@@ -0,0 +1,133 @@
+"""Pitch preserving time-stretch (WSOLA) for Chime TTS."""
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from pydub import AudioSegment
+
+from .mixer import SAMPLE_TYPES
+
+FRAME_MS = 40
+TOLERANCE_MS = 5
+BATCH_FRAMES = 1024
+SEARCH_RATE = 8000
+
+def time_stretch(audio: AudioSegment, speed: float):
+    """Change the speed of audio without changing its pitch, using waveform similarity overlap-add."""
+    if audio is None or speed == 1 or len(audio) == 0:
+        return audio
+    if audio.sample_width not in SAMPLE_TYPES:
+        audio = audio.set_sample_width(2)
+    sample_type = SAMPLE_TYPES[audio.sample_width]
+    sample_info = np.iinfo(sample_type)
+    channels = audio.channels
+
+    samples = np.frombuffer(audio.raw_data, dtype=sample_type)
+    samples = samples.reshape(-1, channels).astype(np.float32)
+
+    frame_length = max(4, int(audio.frame_rate * FRAME_MS / 1000) // 2 * 2)
+    synthesis_hop = frame_length // 2
+    analysis_hop = synthesis_hop * speed
+    tolerance = max(1, int(audio.frame_rate * TOLERANCE_MS / 1000))
+    window = np.hanning(frame_length + 1)[:frame_length].astype(np.float32)
+    # Frames are correlated over twice the tolerance, so the search can follow the previous frame's offset
+    search = 2 * tolerance
+
+    # Pad so every frame and search region lies within the input
+    padding = frame_length + search
+    padded = np.concatenate([np.zeros((padding, channels), dtype=np.float32),
+                             samples,
+                             np.zeros((padding, channels), dtype=np.float32)])
+    mono = padded[:, 0] if channels == 1 else padded.mean(axis=1)
+
+    # Frame k is centred on input sample k * analysis_hop and output sample (k + 1) * synthesis_hop
+    output_frames = int(len(samples) / speed)
+    frame_count = output_frames // synthesis_hop + 2
+    nominal = padding - synthesis_hop + (np.arange(frame_count) * analysis_hop).astype(np.int64)
+    nominal = nominal[nominal + frame_length + search <= len(padded)]
+    offsets = get_frame_offsets(mono, nominal, frame_length, synthesis_hop, tolerance, audio.frame_rate)
+
+    # Overlap-add the windowed frames, half a frame apart
+    output = np.zeros(((frame_count + 1) * synthesis_hop + frame_length, channels), dtype=np.float32)
+    padded_frames = sliding_window_view(padded, frame_length, axis=0)
+    for batch in range(0, len(nominal), BATCH_FRAMES):
+        positions = nominal[batch:batch + BATCH_FRAMES] + offsets[batch:batch + BATCH_FRAMES]
+        frames = (padded_frames[positions] * window).transpose(0, 2, 1)
+        start = batch * synthesis_hop
+        end = start + len(positions) * synthesis_hop
+        output[start:end] += frames[:, :synthesis_hop].reshape(-1, channels)
+        output[start + synthesis_hop:end + synthesis_hop] += frames[:, synthesis_hop:].reshape(-1, channels)
+
+    # Remove the first half frame and trim to the new duration
+    output = output[synthesis_hop:synthesis_hop + output_frames]
+    output = np.clip(np.round(output), sample_info.min, sample_info.max).astype(sample_type)
+    return AudioSegment(data=output.tobytes(),
+                        sample_width=audio.sample_width,
+                        frame_rate=audio.frame_rate,
+                        channels=channels)
+
+
+def get_frame_offsets(mono, nominal, frame_length: int, synthesis_hop: int, tolerance: int, frame_rate: int):
+    """Offset (within the tolerance) from each frame's nominal position to the frame best continuing the previous one.
+
+    The search runs on the mono audio decimated to about SEARCH_RATE. Each
+    frame's search region is cross-correlated with the part of the previous
+    frame's natural continuation it overlaps, from the previous frame's nominal
+    position, over twice the tolerance and in batches with the FFT. The
+    previous frame's chosen offset then only shifts which part of that
+    correlation is searched, and the peak found is refined to the full sample
+    rate by parabolic interpolation.
+    """
+    offsets = np.zeros(len(nominal), dtype=np.int64)
+    if len(nominal) < 2:
+        return offsets
+    decimation = max(1, round(frame_rate / SEARCH_RATE))
+    mono = mono[:len(mono) // decimation * decimation].reshape(-1, decimation) @ np.ones(decimation)
+    template_length = synthesis_hop // decimation
+    tolerance = max(1, tolerance // decimation)
+    search = 2 * tolerance
+    region_length = template_length + 2 * search
+    fft_size = get_fft_size(region_length)
+    template_starts = (nominal[:-1] + synthesis_hop) // decimation
+    region_starts = template_starts + np.round((nominal[1:] - nominal[:-1] - synthesis_hop) / decimation).astype(np.int64) - search
+    mono_templates = sliding_window_view(mono, template_length)
+    mono_regions = sliding_window_view(mono, region_length)
+    correlations = []
+    for batch in range(0, len(template_starts), BATCH_FRAMES):
+        templates = mono_templates[template_starts[batch:batch + BATCH_FRAMES]]
+        regions = mono_regions[region_starts[batch:batch + BATCH_FRAMES]]
+        spectrum = np.fft.rfft(regions, fft_size) * np.conj(np.fft.rfft(templates, fft_size))
+        correlations.append(np.fft.irfft(spectrum, fft_size)[:, :2 * search + 1])
+    correlation = np.concatenate(correlations)
+
+    # Correlation index search + d compares a frame offset by d with the previous frame's continuation,
+    # so the previous frame's offset selects which part of the correlation is searched
+    peaks = np.zeros(len(correlation), dtype=np.int64)
+    offset = 0
+    for frame, frame_correlation in enumerate(correlation):
+        start = tolerance - offset
+        peak = start + int(frame_correlation[start:start + 2 * tolerance + 1].argmax())
+        peaks[frame] = peak
+        offset += peak - search
+
+    # Refine each peak between its neighbouring correlation values
+    rows = np.arange(len(peaks))
+    before = correlation[rows, np.maximum(peaks - 1, 0)]
+    at = correlation[rows, peaks]
+    after = correlation[rows, np.minimum(peaks + 1, 2 * search)]
+    curvature = before - 2 * at + after
+    shift = np.clip(0.5 * (before - after) / np.where(curvature < 0, curvature, -np.inf), -0.5, 0.5)
+    offsets[1:] = np.round((np.cumsum(peaks - search) + shift) * decimation).astype(np.int64)
+    return offsets
+
+
+def get_fft_size(length: int):
+    """Smallest FFT size of at least length with no prime factors above 5 (which the FFT handles fastest)."""
+    size = length
+    while True:
+        remainder = size
+        for factor in (2, 3, 5):
+            while remainder % factor == 0:
+                remainder //= factor
+        if remainder == 1:
+            return size
+        size += 1
@@ -0,0 +1,121 @@
+"""Compare the timeline mixer with sequential pydub combining.
+
+Usage: python scripts/benchmark_mixer.py [segments] [repeats]
+
+pydub creates delays as 11025Hz silence and resamples it to the audio's frame
+rate, which can shift later segments by a few samples. The accuracy check
+therefore compares against pydub combining with silence created at the
+audio's frame rate.
+"""
+
+import importlib.util
+import pathlib
+import sys
+import time
+
+import numpy as np
+from pydub import AudioSegment
+from pydub.generators import Sine
+
+MIXER_PATH = pathlib.Path(__file__).parent.parent / "custom_components" / "chime_tts" / "mixer.py"
+
+
+def load_mixer():
+    """Load the mixer module without importing the Home Assistant integration."""
+    spec = importlib.util.spec_from_file_location("chime_tts_mixer", MIXER_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def pydub_combine(audio_1, audio_2, offset=0, silence_frame_rate=11025):
+    """Combine audio as helpers.combine_audio does."""
+    if audio_1 is None:
+        return audio_2
+    if offset < 0:
+        overlap_point = max(0, len(audio_1) - abs(offset))
+        crossover_audio = audio_1.overlay(audio_2, position=overlap_point)
+        if len(audio_2) > abs(offset):
+            crossover_audio += audio_2[abs(offset):]
+        return crossover_audio
+    if offset > 0:
+        return audio_1 + (AudioSegment.silent(duration=offset, frame_rate=silence_frame_rate) + audio_2)
+    return audio_1 + audio_2
+
+
+def build_segments(count):
+    """Chime, TTS-like tones and delays with a mix of overlays and gaps."""
+    segments = []
+    for index in range(count):
+        if index % 5 == 4:
+            segments.append(("delay", 250, 0))
+        else:
+            audio = Sine(220 + 40 * index).to_audio_segment(duration=1500, volume=-6)
+            audio = audio.set_frame_rate(24000).set_channels(1)
+            offset = [0, -300, 200, 0][index % 4]
+            segments.append(("audio", audio, offset))
+    return segments
+
+
+def render_pydub(segments, silence_frame_rate=11025):
+    """Render the segments by combining them one after another."""
+    output = None
+    for kind, value, offset in segments:
+        if kind == "delay":
+            output = pydub_combine(output, AudioSegment.silent(duration=value, frame_rate=silence_frame_rate))
+        else:
+            output = pydub_combine(output,
+                                   value,
+                                   offset if output is not None else 0,
+                                   silence_frame_rate)
+    return output
+
+
+def render_timeline(mixer, segments):
+    """Render the segments by mixing them into one buffer."""
+    timeline = mixer.ChimeTTSTimeline()
+    for kind, value, offset in segments:
+        if kind == "delay":
+            timeline.add_silence(value)
+        else:
+            timeline.add(value, offset)
+    return mixer.mix_audio(*timeline.get_clips())
+
+
+def measure(function, repeats):
+    """Best time (s) and result of several runs."""
+    best = None
+    result = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = function()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main():
+    """Run the benchmark."""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 25
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    mixer = load_mixer()
+    segments = build_segments(count)
+
+    pydub_time, pydub_audio = measure(lambda: render_pydub(segments), repeats)
+    timeline_time, timeline_audio = measure(lambda: render_timeline(mixer, segments), repeats)
+
+    reference_audio = render_pydub(segments, timeline_audio.frame_rate)
+    samples_1 = np.frombuffer(reference_audio.raw_data, dtype=np.int16).astype(np.int32)
+    samples_2 = np.frombuffer(timeline_audio.raw_data, dtype=np.int16).astype(np.int32)
+    length = min(len(samples_1), len(samples_2))
+    max_difference = int(np.abs(samples_1[:length] - samples_2[:length]).max()) if length > 0 else 0
+
+    sys.stdout.write(f"Segments:            {count}\n")
+    sys.stdout.write(f"pydub combine:       {pydub_time * 1000:.1f} ms ({len(pydub_audio)} ms of audio)\n")
+    sys.stdout.write(f"Timeline mixer:      {timeline_time * 1000:.1f} ms ({len(timeline_audio)} ms of audio)\n")
+    sys.stdout.write(f"Speedup:             {pydub_time / timeline_time:.1f}x\n")
+    sys.stdout.write(f"Max sample diff:     {max_difference} (length difference: {len(samples_1) - len(samples_2)} samples)\n")
+
+
+if __name__ == "__main__":
+    main()
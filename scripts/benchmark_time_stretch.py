@@ -0,0 +1,75 @@
+"""Compare the WSOLA time-stretch with pydub's speedup.
+
+Usage: python scripts/benchmark_time_stretch.py [seconds] [repeats]
+"""
+
+import importlib
+import pathlib
+import sys
+import time
+import types
+
+import numpy as np
+from pydub.generators import Sine
+
+PACKAGE_PATH = pathlib.Path(__file__).parent.parent / "custom_components" / "chime_tts"
+PACKAGE_NAME = "chime_tts_benchmark"
+SPEEDS = [125, 150, 175, 200]
+
+
+def load_time_stretch():
+    """Load the time-stretch module (and the mixer module it imports) without importing the Home Assistant integration."""
+    package = types.ModuleType(PACKAGE_NAME)
+    package.__path__ = [str(PACKAGE_PATH)]
+    sys.modules[PACKAGE_NAME] = package
+    return importlib.import_module(f"{PACKAGE_NAME}.time_stretch")
+
+
+def pydub_speedup(audio, playback_speed):
+    """Change the playback speed as helpers.change_playback_speed does with the pydub engine."""
+    speed = float(playback_speed / 100)
+    if playback_speed > 150:
+        return audio.speedup(playback_speed=speed, chunk_size=50)
+    return audio.speedup(playback_speed=speed)
+
+
+def measure(function, repeats):
+    """Best time (s) and result of several runs."""
+    best = None
+    result = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = function()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def dominant_frequency(audio):
+    """Frequency (Hz) with the most energy, to check the pitch is unchanged."""
+    samples = np.frombuffer(audio.raw_data, dtype=np.int16).astype(np.float32)
+    spectrum = np.abs(np.fft.rfft(samples))
+    return round(float(np.argmax(spectrum)) * audio.frame_rate / len(samples))
+
+
+def main():
+    """Run the benchmark."""
+    seconds = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+    time_stretch = load_time_stretch()
+    audio = Sine(440).to_audio_segment(duration=seconds * 1000, volume=-6)
+    audio = audio.set_frame_rate(24000).set_channels(1)
+
+    sys.stdout.write(f"{seconds}s of 24kHz mono audio at 440Hz\n")
+    sys.stdout.write("Speed  pydub (ms)  WSOLA (ms)  Speedup  Pitch pydub/WSOLA (Hz)\n")
+    for speed in SPEEDS:
+        pydub_time, pydub_audio = measure(lambda speed=speed: pydub_speedup(audio, speed), repeats)
+        wsola_time, wsola_audio = measure(lambda speed=speed: time_stretch.time_stretch(audio, speed / 100), repeats)
+        sys.stdout.write(
+            f"{speed:>4}%  {pydub_time * 1000:>10.1f}  {wsola_time * 1000:>10.1f}  {pydub_time / wsola_time:>6.1f}x"
+            f"  {dominant_frequency(pydub_audio)}/{dominant_frequency(wsola_audio)}\n"
+        )
+
+
+if __name__ == "__main__":
+    main()